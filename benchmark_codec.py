@@ -0,0 +1,75 @@
+# benchmark_codec.py
+
+import time
+from dataclasses import dataclass
+
+from dataplace import ModelIO, ColumnBatch
+from dataplace.frame import encode, decode
+
+RUNS = 100_000
+BATCH = 1000
+
+@dataclass(slots=True, frozen=True)
+class JSONTick(ModelIO):
+    id: int
+    price: float
+    size: int
+    buy: bool
+    symbol: str
+
+@dataclass(slots=True, frozen=True)
+class StructTick(ModelIO):
+    __struct__ = True
+
+    id: int
+    price: float
+    size: int
+    buy: bool
+    symbol: str
+
+def measure(function: ..., value: ..., runs: int = RUNS) -> float:
+
+    start = time.perf_counter()
+
+    for _ in range(runs):
+        function(value)
+
+    return (time.perf_counter() - start) / runs
+
+def main() -> None:
+
+    for model in (JSONTick, StructTick):
+        record = model(id=1, price=101.25, size=300, buy=True, symbol="AAPL")
+        payload = encode(record)
+
+        print(
+            f"{model.__name__:<12}: {len(payload)} bytes, "
+            f"encode {measure(encode, record) * 1e6:.2f}us, "
+            f"decode {measure(decode, payload) * 1e6:.2f}us"
+        )
+
+    records = [
+        JSONTick(id=i, price=101.25, size=300, buy=True, symbol="AAPL")
+        for i in range(BATCH)
+    ]
+    payload = ColumnBatch.from_records(records).encode()
+    runs = RUNS // BATCH
+
+    encoding = measure(
+        lambda values: ColumnBatch.from_records(values).encode(),
+        records, runs=runs
+    )
+    columns = measure(ColumnBatch.decode, payload, runs=runs)
+    loading = measure(
+        lambda data: ColumnBatch.decode(data).records(), payload, runs=runs
+    )
+
+    print(
+        f"{'ColumnBatch':<12}: {len(payload) / BATCH:.1f} bytes, "
+        f"encode {encoding / BATCH * 1e6:.2f}us, "
+        f"decode {columns / BATCH * 1e6:.2f}us into columns, "
+        f"{loading / BATCH * 1e6:.2f}us into records, per record"
+    )
+
+if __name__ == "__main__":
+    main()
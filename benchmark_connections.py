@@ -0,0 +1,149 @@
+# benchmark_connections.py
+
+import os
+import json
+import time
+import asyncio
+import resource
+import multiprocessing
+from dataclasses import dataclass
+
+from dataplace import ModelIO, Sender, read_frame, percentiles
+
+@dataclass(slots=True, frozen=True)
+class Tick(ModelIO):
+
+    value: int
+    sent: float
+
+HOST = "127.0.0.1"
+PORT = 5560
+
+CLIENTS = 10_000
+RECORDS = 50
+INTERVAL = 0.05
+BATCH = 100
+
+def raise_file_limit() -> None:
+
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+
+    if soft < hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+def memory() -> int:
+
+    try:
+        with open("/proc/self/statm") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+async def read_ticks(
+        reader: asyncio.StreamReader, latencies: list[float]
+) -> None:
+
+    for _ in range(RECORDS):
+        frame = await read_frame(reader)
+
+        if frame is None:
+            return
+
+        latencies.append(time.time() - json.loads(frame.payload)["sent"])
+
+async def run_clients(clients: int, results: multiprocessing.Queue) -> None:
+
+    connections = []
+
+    for start in range(0, clients, BATCH):
+        connections.extend(
+            await asyncio.gather(
+                *(
+                    asyncio.open_connection(HOST, PORT)
+                    for _ in range(min(BATCH, clients - start))
+                )
+            )
+        )
+
+    latencies: list[float] = []
+
+    results.put(len(connections))
+
+    await asyncio.gather(
+        *(read_ticks(reader, latencies) for reader, _ in connections)
+    )
+
+    for _, writer in connections:
+        writer.close()
+
+    results.put(latencies)
+
+def clients_process(clients: int, results: multiprocessing.Queue) -> None:
+
+    raise_file_limit()
+
+    asyncio.run(run_clients(clients, results))
+
+async def measure(clients: int = CLIENTS) -> None:
+
+    server = Sender.Socket.Server(host=HOST, port=PORT)
+
+    server_task = asyncio.create_task(server.start())
+    await asyncio.sleep(0.2)
+
+    before = memory()
+
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+
+    process = context.Process(target=clients_process, args=(clients, results))
+    process.start()
+
+    loop = asyncio.get_running_loop()
+
+    connected = await loop.run_in_executor(None, results.get)
+
+    while len(server.connections) < connected:
+        await asyncio.sleep(0.1)
+
+    after = memory()
+
+    calls = []
+
+    for i in range(RECORDS):
+        start = time.perf_counter()
+
+        await server.call(Tick(value=i, sent=time.time()))
+
+        calls.append(time.perf_counter() - start)
+
+        await asyncio.sleep(INTERVAL)
+
+    latencies = await loop.run_in_executor(None, results.get)
+
+    process.join()
+
+    server_task.cancel()
+
+    print(
+        f"{connected} connections: "
+        f"{(after - before) / connected / 1024:.1f} KiB/connection"
+    )
+
+    for name, values in (("call", calls), ("delivery", latencies)):
+        print(
+            f"{name:>8}: " + ", ".join(
+                f"{point} {value * 1e3:.2f}ms"
+                for point, value in percentiles(values).items()
+            )
+        )
+
+def main() -> None:
+
+    raise_file_limit()
+
+    asyncio.run(measure())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+# benchmark_startup.py
+
+import sys
+import time
+import subprocess
+
+from dataplace import percentiles
+
+RUNS = 20
+
+STATEMENTS = (
+    "pass",
+    "import asyncio",
+    "import dataplace",
+    "from dataplace import ModelIO, Controller, Callback, SpaceStore",
+    "from dataplace import Sender; Sender.Socket.Server",
+    "from dataplace import Receiver; Receiver.Socket.Client",
+    "from dataplace import Sender; Sender.WebSocket.Server",
+)
+
+def measure(statement: str, runs: int = RUNS) -> list[float]:
+
+    times = []
+
+    for _ in range(runs):
+        start = time.perf_counter()
+
+        subprocess.run([sys.executable, "-c", statement], check=True)
+
+        times.append(time.perf_counter() - start)
+
+    return times
+
+def main() -> None:
+
+    for statement in STATEMENTS:
+        print(
+            f"{statement:<60}: " + ", ".join(
+                f"{point} {value * 1e3:.1f}ms"
+                for point, value in percentiles(
+                    measure(statement), points=(50, 90)
+                ).items()
+            )
+        )
+
+if __name__ == "__main__":
+    main()
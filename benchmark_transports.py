@@ -0,0 +1,98 @@
+# benchmark_transports.py
+
+import os
+import time
+import asyncio
+import tempfile
+from uuid import uuid4
+from dataclasses import dataclass
+
+from dataplace import ModelIO, Sender, Receiver, Callback
+
+@dataclass(slots=True, frozen=True)
+class Data(ModelIO):
+
+    id: str
+    value: int
+
+COUNT = 20_000
+BATCH = 100
+
+async def measure(sender, receiver, count: int = COUNT) -> float:
+
+    received = asyncio.Event()
+    counter = [0]
+
+    def count_record(_: Data) -> None:
+
+        counter[0] += 1
+
+        if counter[0] == count:
+            received.set()
+
+    receiver.callbacks.append(Callback(count_record, types={Data}))
+
+    sender_task = asyncio.create_task(sender.start())
+    await asyncio.sleep(0.2)
+    receiver_task = asyncio.create_task(receiver.start())
+    await asyncio.sleep(0.2)
+
+    records = [Data(id=str(uuid4()), value=i) for i in range(count)]
+
+    start = time.perf_counter()
+
+    for i, record in enumerate(records):
+        await sender.call(record)
+
+        if i % BATCH == 0:
+            await asyncio.sleep(0)
+
+    await asyncio.wait_for(received.wait(), timeout=120)
+
+    elapsed = time.perf_counter() - start
+
+    receiver.running = False
+    sender.running = False
+
+    for task in (receiver_task, sender_task):
+        task.cancel()
+
+    return elapsed
+
+def main() -> None:
+
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, "dataplace.sock")
+    name = f"dataplace-{uuid4().hex[:8]}"
+
+    cases = {
+        "tcp": lambda: (
+            Sender.Socket.Server(host="127.0.0.1", port=5555, delay=1e-6),
+            Receiver.Socket.Client(host="127.0.0.1", port=5555, delay=1e-6)
+        ),
+        "unix": lambda: (
+            Sender.Unix.Server(path=path, delay=1e-6),
+            Receiver.Unix.Client(path=path, delay=1e-6)
+        ),
+        "shared memory": lambda: (
+            Sender.SharedMemory.Server(name=name),
+            Receiver.SharedMemory.Client(name=name, delay=1e-6)
+        )
+    }
+
+    for transport, factory in cases.items():
+        sender, receiver = factory()
+
+        elapsed = asyncio.run(measure(sender, receiver))
+
+        if isinstance(sender, Sender.SharedMemory.Server):
+            sender.ring.close()
+
+        print(
+            f"{transport:>14}: {COUNT} records in {elapsed:.3f}s, "
+            f"{COUNT / elapsed:,.0f} records/s, "
+            f"{elapsed / COUNT * 1e6:.1f} us/record"
+        )
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,115 @@
 # __init__.py
 
+import importlib
+
 from dataplace.base import *
 from dataplace.callback import *
+from dataplace.codec import *
+from dataplace.columns import *
 from dataplace.control import *
+from dataplace.datagram import *
+from dataplace.dedupe import *
+from dataplace.frame import *
 from dataplace.handler import *
 from dataplace.io import *
-from dataplace.receive import *
-from dataplace.send import *
+from dataplace.registry import *
+from dataplace.replay import *
+from dataplace.ring import *
+from dataplace.spill import *
 from dataplace.store import *
+from dataplace.unix import *
+
+# the transport modules are only imported once one of their names is
+# used, so processes that never use websockets do not pay for importing
+LAZY = {
+    "dataplace.capture": (
+        "CaptureWriter",
+        "CaptureReader",
+        "CapturePlayer",
+        "LatencyProbe",
+        "percentiles"
+    ),
+    "dataplace.journal": (
+        "Journal",
+        "JournalReader"
+    ),
+    "dataplace.receive": (
+        "ReceiverSequence",
+        "ReceiverSocket",
+        "ReceiverSocketServer",
+        "ReceiverSocketClient",
+        "ReceiverWebSocketServer",
+        "ReceiverWebSocketClient",
+        "ReceiverClient",
+        "ReceiverServer",
+        "ReceiverWebSocket",
+        "ReceiverUnix",
+        "ReceiverUnixServer",
+        "ReceiverUnixClient",
+        "ReceiverSharedMemoryClient",
+        "ReceiverDatagramServer",
+        "ReceiverMergeClient",
+        "FrameCollector",
+        "BaseReceiver",
+        "Receiver"
+    ),
+    "dataplace.relay": (
+        "Relay",
+    ),
+    "dataplace.send": (
+        "SenderWebSocket",
+        "SenderServer",
+        "SenderSocket",
+        "SenderClient",
+        "SenderSocketServer",
+        "SenderSocketClient",
+        "SenderWebSocketServer",
+        "SenderWebSocketClient",
+        "SenderUnix",
+        "SenderUnixServer",
+        "SenderUnixClient",
+        "SenderSharedMemoryServer",
+        "SenderDatagramClient",
+        "SenderSocketClusterServer",
+        "BaseSender",
+        "Sender"
+    ),
+    "dataplace.shard": (
+        "HashRing",
+        "ShardPublisher",
+        "ShardSubscriber",
+        "shard_hash",
+        "endpoint"
+    )
+}
+
+MODULES = {name: module for module, names in LAZY.items() for name in names}
+
+__all__ = [
+    *(
+        name
+        for module in (
+            base, callback, codec, columns, control, datagram, dedupe, frame,
+            handler, io, registry, replay, ring, spill, store, unix
+        )
+        for name in module.__all__
+    ),
+    *MODULES
+]
+
+def __getattr__(name: str) -> ...:
+
+    module = MODULES.get(name)
+
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module), name)
+
+    globals()[name] = value
+
+    return value
+
+def __dir__() -> list[str]:
+
+    return sorted({*globals(), *MODULES})
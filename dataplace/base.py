@@ -1,6 +1,7 @@
 # base.py
 
 from abc import ABCMeta, abstractmethod
+import asyncio
 
 from dataplace.callback import Callback
 from dataplace.control import Controller
@@ -31,6 +32,8 @@ class BaseCommunicator(Controller, metaclass=ABCMeta):
 
         self._connected = False
         self._closed = False
+        self._draining = False
+        self._pending = 0
 
         super().__init__(
             callbacks=callbacks,
@@ -52,6 +55,21 @@ class BaseCommunicator(Controller, metaclass=ABCMeta):
 
         return self._closed
 
+    @property
+    def draining(self) -> bool:
+
+        return self._draining
+
+    async def async_callback(self, data: ...) -> None:
+
+        self._pending += 1
+
+        try:
+            await super().async_callback(data)
+
+        finally:
+            self._pending -= 1
+
     async def send(self, **kwargs) -> None:
 
         pass
@@ -92,6 +110,33 @@ class BaseCommunicator(Controller, metaclass=ABCMeta):
         if self.connected and not self.closed:
             await self._close()
 
+    async def drained(self) -> None:
+        """Waits until the callbacks in progress are done."""
+
+        while self._pending:
+            await asyncio.sleep(self.delay)
+
+    async def drain(self, timeout: float = None) -> None:
+        """
+        Stops after delivering the records that were already accepted.
+
+        New records are refused once draining starts. The communicator is
+        stopped when the accepted records are delivered and the callbacks
+        in progress are done, or when the timeout has passed.
+
+        :param timeout: The longest time to wait before stopping.
+        """
+
+        self._draining = True
+
+        try:
+            await asyncio.wait_for(self.drained(), timeout=timeout)
+
+        except asyncio.TimeoutError:
+            pass
+
+        await self.stop()
+
     async def start(self) -> None:
 
         if not self.connected:
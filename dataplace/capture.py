@@ -0,0 +1,186 @@
+# capture.py
+
+import os
+import mmap
+import time
+import struct
+import asyncio
+from typing import Generator
+
+from dataplace.io import ModelIO
+from dataplace.frame import Frame, encode
+from dataplace.send import BaseSender
+
+__all__ = [
+    "CaptureWriter",
+    "CaptureReader",
+    "CapturePlayer",
+    "LatencyProbe",
+    "percentiles"
+]
+
+# receive timestamp, payload length
+CAPTURE_RECORD = struct.Struct("!dI")
+
+class CaptureWriter:
+    """
+    Writes a stream to a capture file of timestamped payloads.
+
+    Used as a callback of a raw receiver, the payloads are stored
+    without decoding, so capturing needs no model classes.
+    """
+
+    def __init__(self, path: str) -> None:
+
+        self.path = path
+        self.file = open(path, "ab")
+        self.count = 0
+
+    def write(
+            self, data: Frame | ModelIO | bytes, timestamp: float = None
+    ) -> None:
+
+        if timestamp is None:
+            timestamp = time.time()
+
+        if isinstance(data, Frame):
+            payload = data.payload
+
+        elif isinstance(data, bytes):
+            payload = data
+
+        else:
+            payload = encode(data)
+
+        self.file.write(CAPTURE_RECORD.pack(timestamp, len(payload)) + payload)
+
+        self.count += 1
+
+    def close(self) -> None:
+
+        self.file.close()
+
+class CaptureReader:
+
+    def __init__(self, path: str) -> None:
+
+        self.path = path
+
+    def __iter__(self) -> Generator[tuple[float, bytes], ..., ...]:
+
+        if not os.path.getsize(self.path):
+            return
+
+        with (
+            open(self.path, "rb") as file,
+            mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as memory
+        ):
+            offset = 0
+
+            while offset + CAPTURE_RECORD.size <= len(memory):
+                timestamp, length = CAPTURE_RECORD.unpack_from(memory, offset)
+
+                offset += CAPTURE_RECORD.size
+
+                yield timestamp, memory[offset:offset + length]
+
+                offset += length
+
+class CapturePlayer:
+    """
+    Replays a capture file through a sender.
+
+    With a speed, the original gaps between the records are kept, divided
+    by the speed, with None, the records are sent as fast as possible.
+    The send time of every record is kept to measure delivery latency.
+    """
+
+    BATCH = 100
+
+    def __init__(
+            self,
+            sender: BaseSender,
+            path: str,
+            speed: float | None = 1.0
+    ) -> None:
+
+        self.sender = sender
+        self.path = path
+        self.speed = speed
+
+        self.times: list[float] = []
+        self.start = 0.0
+        self.end = 0.0
+
+    @property
+    def elapsed(self) -> float:
+
+        return self.end - self.start
+
+    async def play(self) -> int:
+
+        self.times.clear()
+
+        first = None
+        self.start = time.perf_counter()
+
+        for timestamp, payload in CaptureReader(self.path):
+            if first is None:
+                first = timestamp
+
+            if self.speed:
+                delay = (
+                    self.start + (timestamp - first) / self.speed -
+                    time.perf_counter()
+                )
+
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+            elif len(self.times) % self.BATCH == 0:
+                await asyncio.sleep(0)
+
+            self.times.append(time.perf_counter())
+
+            await self.sender.call(payload)
+
+        self.end = time.perf_counter()
+
+        return len(self.times)
+
+class LatencyProbe:
+    """A callback that keeps the receive time of every record."""
+
+    def __init__(self) -> None:
+
+        self.times: list[float] = []
+
+    def __call__(self, data: ...) -> None:
+
+        self.times.append(time.perf_counter())
+
+    def latencies(self, sent: list[float]) -> list[float]:
+
+        return [
+            received - sent_at
+            for sent_at, received in zip(sent, self.times)
+        ]
+
+def percentiles(
+        values: list[float], points: tuple[float, ...] = (50, 90, 99, 99.9)
+) -> dict[str, float]:
+
+    if not values:
+        return {}
+
+    values = sorted(values)
+    last = len(values) - 1
+
+    result = {
+        f"p{point:g}": values[min(int(len(values) * point / 100), last)]
+        for point in points
+    }
+
+    result["max"] = values[-1]
+
+    return result
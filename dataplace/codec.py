@@ -0,0 +1,299 @@
+# codec.py
+
+import struct
+import zlib
+import typing
+import dataclasses
+from typing import ClassVar, Callable
+
+from dataplace.io import ModelIO, compile_builder
+
+__all__ = [
+    "StructCodec",
+    "STRUCT_MAGIC",
+    "STRUCT_HEADER",
+    "struct_format",
+    "struct_fields"
+]
+
+# never the first byte of a json payload
+STRUCT_MAGIC = 0xDC
+
+# magic, type label length, layout fingerprint, followed by the type label
+STRUCT_HEADER = struct.Struct("!BBI")
+
+# the default formats of the field types, where strings
+# and bytes are stored as their length, followed by the tail
+FORMATS = {int: "q", float: "d", bool: "?", str: "I", bytes: "I"}
+
+# the fixed size struct formats a field may choose for a number
+NUMBERS = frozenset("bBhHiIlLqQefd?")
+
+def struct_format(annotation: object) -> str:
+    """
+    Finds the struct format of a field type.
+
+    An int, float or bool field may choose a narrower format as the
+    metadata of an annotated type, like Annotated[int, "i"].
+
+    :param annotation: The type annotation of the field.
+
+    :return: The format character.
+    """
+
+    if typing.get_origin(annotation) is typing.Annotated:
+        base, *metadata = typing.get_args(annotation)
+
+        for item in metadata:
+            if isinstance(item, str) and item in NUMBERS:
+                if base not in (int, float, bool):
+                    raise ValueError(
+                        f"A struct format can only be chosen for "
+                        f"a number field, not for {base}."
+                    )
+
+                return item
+
+        annotation = base
+
+    if annotation not in FORMATS:
+        raise ValueError(
+            f"{annotation} fields can not be packed into a struct row, "
+            f"only fields of {', '.join(kind.__name__ for kind in FORMATS)}."
+        )
+
+    return FORMATS[annotation]
+
+def struct_fields(model: type[ModelIO]) -> list[tuple[str, str, type]]:
+    """
+    Finds the struct formats of the fields of a flat dataclass model.
+
+    :param model: The model class.
+
+    :return: The name, format character and type of each field.
+    """
+
+    if not dataclasses.is_dataclass(model):
+        raise ValueError(
+            f"Only dataclass models have a struct layout, not {model}."
+        )
+
+    try:
+        hints = typing.get_type_hints(model, include_extras=True)
+
+    except (NameError, TypeError):
+        hints = {}
+
+    fields = []
+
+    for field in dataclasses.fields(model):
+        annotation = hints.get(field.name, field.type)
+        code = struct_format(annotation)
+
+        if typing.get_origin(annotation) is typing.Annotated:
+            annotation = typing.get_args(annotation)[0]
+
+        fields.append((field.name, code, annotation))
+
+    return fields
+
+class StructCodec:
+    """
+    A binary codec of a flat dataclass model, with a fixed row layout.
+
+    The layout is derived once from the field annotations. Each record
+    is encoded as a header with its type label and the fingerprint of
+    the layout, a row of all the fields, packed by a single struct, and
+    a tail with the data of the str and bytes fields, whose lengths are
+    in the row. The receiver decodes the record with the layout of its
+    own class of the label, and rejects a record of a different layout.
+
+    Models opt in with a true __struct__ class attribute, and are then
+    encoded with the codec instead of json, anywhere records are sent.
+    """
+
+    CODECS: ClassVar[dict[type[ModelIO], "StructCodec"]] = {}
+    DECODERS: ClassVar[dict[bytes, "StructCodec"]] = {}
+
+    def __init__(self, model: type[ModelIO]) -> None:
+
+        fields = struct_fields(model)
+
+        self.model = model
+        self.label = model.__model__ or model.__name__
+        self.names = tuple(name for name, _, _ in fields)
+        self.kinds = tuple(kind for _, _, kind in fields)
+        self.row = struct.Struct("!" + "".join(code for _, code, _ in fields))
+
+        label = self.label.encode()
+
+        self.fingerprint = zlib.crc32(
+            f"{self.label}:{','.join(self.names)}:{self.row.format}".encode()
+        )
+        self.header = STRUCT_HEADER.pack(
+            STRUCT_MAGIC, len(label), self.fingerprint
+        ) + label
+
+        self.encode: Callable[[ModelIO], bytes] = self.compile_encoder()
+        self.decode: Callable[[bytes], ModelIO] = self.compile_decoder()
+
+    def __repr__(self) -> str:
+
+        return (
+            f"{type(self).__name__}("
+            f"model={self.label}, format={self.row.format!r})"
+        )
+
+    @classmethod
+    def of(cls, model: type[ModelIO]) -> "StructCodec":
+        """
+        Finds the codec of a model, creating it on the first use.
+
+        :param model: The model class.
+
+        :return: The codec.
+        """
+
+        codec = cls.CODECS.get(model)
+
+        if codec is None:
+            codec = cls.CODECS[model] = cls(model)
+
+        return codec
+
+    @classmethod
+    def find(cls, payload: bytes) -> "StructCodec":
+        """
+        Finds the codec of an encoded record, by its type label.
+
+        :param payload: The encoded record.
+
+        :return: The codec.
+        """
+
+        # the second byte is the length of the type label
+        header = bytes(payload[:STRUCT_HEADER.size + payload[1]])
+
+        codec = cls.DECODERS.get(header)
+
+        # the label may have been given to a new class since
+        if codec is not None and ModelIO.TYPES[codec.label][0] is codec.model:
+            return codec
+
+        label = header[STRUCT_HEADER.size:].decode()
+
+        if label not in ModelIO.TYPES:
+            raise KeyError(f"{label} is not recognized as a model type.")
+
+        codec = cls.of(ModelIO.TYPES[label][0])
+
+        if codec.header != header:
+            raise ValueError(
+                f"The struct layout of the received {label} records "
+                f"differs from the layout of {codec.model}."
+            )
+
+        cls.DECODERS[header] = codec
+
+        return codec
+
+    @classmethod
+    def load(cls, payload: bytes) -> ModelIO:
+        """
+        Decodes an encoded record of any model.
+
+        :param payload: The encoded record.
+
+        :return: The record.
+        """
+
+        return cls.find(payload).decode(payload)
+
+    def loader(self) -> Callable[[tuple], ModelIO]:
+
+        model = self.model
+
+        if model.load_values.__func__ is not ModelIO.load_values.__func__:
+            return model.load_values
+
+        return compile_builder(model, positional=True)
+
+    def compile_encoder(self) -> Callable[[ModelIO], bytes]:
+
+        namespace = {"header": self.header, "pack": self.row.pack}
+
+        values = []
+        tails = []
+
+        for name, kind in zip(self.names, self.kinds):
+            if kind is str:
+                values.append(f"len(tail_{len(tails)})")
+                tails.append(f"obj.{name}.encode()")
+
+            elif kind is bytes:
+                values.append(f"len(tail_{len(tails)})")
+                tails.append(f"obj.{name}")
+
+            else:
+                values.append(f"obj.{name}")
+
+        exec(
+            "def encode(obj):\n" + "".join(
+                f"    tail_{index} = {tail}\n"
+                for index, tail in enumerate(tails)
+            ) +
+            "    return b''.join((header, pack(" + "".join(
+                f"{value}, " for value in values
+            ) + ")" + "".join(
+                f", tail_{index}" for index in range(len(tails))
+            ) + "))\n",
+            namespace
+        )
+
+        return namespace["encode"]
+
+    def compile_decoder(self) -> Callable[[bytes], ModelIO]:
+
+        namespace = {
+            "start": len(self.header),
+            "end": len(self.header) + self.row.size,
+            "unpack": self.row.unpack_from,
+            "load": self.loader()
+        }
+
+        lines = [
+            "def decode(payload):\n",
+            "    row = unpack(payload, start)\n",
+            "    offset = end\n"
+        ]
+        values = []
+
+        for index, kind in enumerate(self.kinds):
+            if kind not in (str, bytes):
+                values.append(f"row[{index}]")
+
+                continue
+
+            lines.append(f"    tail = offset + row[{index}]\n")
+
+            if kind is str:
+                lines.append(
+                    f"    value_{index} = str(payload[offset:tail], 'utf-8')\n"
+                )
+
+            else:
+                lines.append(f"    value_{index} = bytes(payload[offset:tail])\n")
+
+            lines.append("    offset = tail\n")
+
+            values.append(f"value_{index}")
+
+        lines.append(
+            "    return load((" + "".join(
+                f"{value}, " for value in values
+            ) + "))\n"
+        )
+
+        exec("".join(lines), namespace)
+
+        return namespace["decode"]
@@ -0,0 +1,365 @@
+# columns.py
+
+import sys
+import struct
+import itertools
+import operator
+from array import array
+from typing import ClassVar, Iterable
+
+from dataplace.io import ModelIO
+from dataplace.codec import struct_fields
+
+__all__ = [
+    "ColumnBatch",
+    "COLUMNS_MAGIC",
+    "COLUMNS_HEADER"
+]
+
+# never the first byte of a json payload or a struct row
+COLUMNS_MAGIC = 0xDD
+
+# magic, type label length, field count, record count, followed by the
+# type label, the name length, name and code of each field, and the columns
+COLUMNS_HEADER = struct.Struct("!BBHI")
+COLUMN_NAME = struct.Struct("!B")
+
+def sized(fmt: str, codes: str) -> str:
+    """
+    Finds the array code with the standard size of a struct format,
+    the same character when its size matches.
+
+    :param fmt: The struct format character.
+    :param codes: The other array codes to choose from.
+
+    :return: The array code.
+    """
+
+    size = struct.calcsize("!" + fmt)
+
+    for code in (fmt, *codes):
+        if array(code).itemsize == size:
+            return code
+
+    raise ValueError(f"No array code has the size of struct format {fmt!r}.")
+
+# the array codes of the field formats, with the standard struct sizes on
+# every platform, where half floats are widened to floats, and str and
+# bytes columns are an array of 4 bytes offsets, followed by the data
+ARRAYS = {
+    **{code: sized(code, "bhilq") for code in "bhilq"},
+    **{code: sized(code, "BHILQ") for code in "BHILQ"},
+    "e": "f", "f": "f", "d": "d", "?": "B",
+    "s": sized("I", "BHILQ"), "y": sized("I", "BHILQ")
+}
+
+# the struct formats of the column item sizes, where they differ
+WIDTHS = {"e": "f", "s": "I", "y": "I"}
+
+assert all(
+    array(kind).itemsize == struct.calcsize("!" + WIDTHS.get(code, code))
+    for code, kind in ARRAYS.items()
+)
+
+# the columns are sent in little endian order
+SWAP = sys.byteorder == "big"
+
+Column = array | list[str] | list[bytes]
+
+class ColumnBatch:
+    """
+    A batch of records of one model type, kept as a column for each field.
+
+    A batch is encoded as a single payload, with a header of the type
+    label and the name and code of each field, followed by every column,
+    where the numbers are packed arrays and the str and bytes are the
+    offsets of each value, followed by their joined data. The field
+    names are only sent once for the batch, and the columns are written
+    and read as whole buffers.
+
+    The columns are arrays, or lists of str and bytes, and can be used
+    as they are by vectorized consumers, or loaded back into records.
+    """
+
+    FIELDS: ClassVar[dict[type[ModelIO], list[tuple[str, str]]]] = {}
+
+    def __init__(
+            self,
+            label: str,
+            columns: dict[str, Column],
+            codes: dict[str, str],
+            count: int = None
+    ) -> None:
+
+        self.label = label
+        self.columns = columns
+        self.codes = codes
+
+        if count is None:
+            count = len(next(iter(columns.values()), ()))
+
+        self.count = count
+
+    def __len__(self) -> int:
+
+        return self.count
+
+    def __repr__(self) -> str:
+
+        return (
+            f"{type(self).__name__}("
+            f"label={self.label}, count={self.count}, "
+            f"fields={list(self.columns)})"
+        )
+
+    @classmethod
+    def fields(cls, model: type[ModelIO]) -> list[tuple[str, str]]:
+        """
+        Finds the name and column code of each field of a model.
+
+        :param model: The model class.
+
+        :return: The names and codes.
+        """
+
+        fields = cls.FIELDS.get(model)
+
+        if fields is None:
+            fields = cls.FIELDS[model] = [
+                (
+                    name,
+                    "s" if kind is str else "y" if kind is bytes else code
+                )
+                for name, code, kind in struct_fields(model)
+            ]
+
+        return fields
+
+    @classmethod
+    def from_records(cls, records: Iterable[ModelIO]) -> "ColumnBatch":
+        """
+        Collects the columns of records of the same model type.
+
+        :param records: The records.
+
+        :return: The batch.
+        """
+
+        records = list(records)
+
+        if not records:
+            raise ValueError("A column batch must have at least one record.")
+
+        model = type(records[0])
+
+        if any(type(record) is not model for record in records):
+            raise ValueError(
+                f"All records of a column batch must be of {model}."
+            )
+
+        columns = {}
+        codes = {}
+
+        for name, code in cls.fields(model):
+            values = map(operator.attrgetter(name), records)
+
+            if code in ("s", "y"):
+                columns[name] = list(values)
+
+            else:
+                columns[name] = array(ARRAYS[code], values)
+
+            codes[name] = code
+
+        return cls(
+            label=model.__model__ or model.__name__, columns=columns,
+            codes=codes, count=len(records)
+        )
+
+    def encode(self) -> bytes:
+        """
+        Encodes the batch into a single payload.
+
+        :return: The payload.
+        """
+
+        label = self.label.encode()
+
+        parts = [
+            COLUMNS_HEADER.pack(
+                COLUMNS_MAGIC, len(label), len(self.columns), self.count
+            ),
+            label
+        ]
+
+        for name, code in self.codes.items():
+            name = name.encode()
+
+            parts.extend((COLUMN_NAME.pack(len(name)), name, code.encode()))
+
+        for name, column in self.columns.items():
+            code = self.codes[name]
+
+            if code in ("s", "y"):
+                if code == "s":
+                    column = [value.encode() for value in column]
+
+                offsets = array(
+                    "I", itertools.accumulate(map(len, column), initial=0)
+                )
+
+                parts.extend((self.pack(offsets), b"".join(column)))
+
+            else:
+                parts.append(self.pack(column))
+
+        return b"".join(parts)
+
+    @staticmethod
+    def pack(column: array) -> bytes:
+
+        if SWAP:
+            column = array(column.typecode, column)
+            column.byteswap()
+
+        return column.tobytes()
+
+    @staticmethod
+    def unpack(code: str, data: memoryview) -> array:
+
+        column = array(code)
+        column.frombytes(data)
+
+        if SWAP:
+            column.byteswap()
+
+        return column
+
+    @classmethod
+    def decode(cls, payload: bytes) -> "ColumnBatch":
+        """
+        Decodes a batch from its payload, without loading its records.
+
+        :param payload: The payload.
+
+        :return: The batch.
+        """
+
+        _, length, width, count = COLUMNS_HEADER.unpack_from(payload)
+
+        data = memoryview(payload)
+        offset = COLUMNS_HEADER.size
+
+        label = str(data[offset:offset + length], "utf-8")
+        offset += length
+
+        codes = {}
+
+        for _ in range(width):
+            size = data[offset]
+            offset += COLUMN_NAME.size
+
+            name = str(data[offset:offset + size], "utf-8")
+            offset += size
+
+            codes[name] = chr(data[offset])
+            offset += 1
+
+        columns = {}
+
+        for name, code in codes.items():
+            if code not in ARRAYS:
+                raise ValueError(f"Unknown column code {code!r} of {name}.")
+
+            kind = ARRAYS[code]
+
+            if code in ("s", "y"):
+                size = (count + 1) * array(kind).itemsize
+                offsets = cls.unpack(kind, data[offset:offset + size])
+                offset += size
+
+                end = offset + offsets[-1]
+                values = bytes(data[offset:end])
+                offset = end
+
+                columns[name] = cls.split(values, offsets, text=code == "s")
+
+            else:
+                size = count * array(kind).itemsize
+                columns[name] = cls.unpack(kind, data[offset:offset + size])
+                offset += size
+
+        return cls(label=label, columns=columns, codes=codes, count=count)
+
+    @staticmethod
+    def split(
+            data: bytes, offsets: array, text: bool = False
+    ) -> list[str] | list[bytes]:
+
+        if text and data.isascii():
+            # ascii offsets are the same for the bytes and the text
+            data = data.decode()
+            text = False
+
+        values = [data[start:end] for start, end in itertools.pairwise(offsets)]
+
+        if text:
+            return [value.decode() for value in values]
+
+        return values
+
+    def model(self) -> type[ModelIO]:
+        """
+        Finds the model class of the label.
+
+        :return: The model class.
+        """
+
+        if self.label not in ModelIO.TYPES:
+            raise KeyError(f"{self.label} is not recognized as a model type.")
+
+        return ModelIO.TYPES[self.label][0]
+
+    def records(self) -> list[ModelIO]:
+        """
+        Loads the records of the batch.
+
+        :return: The records, in the batch order.
+        """
+
+        model = self.model()
+
+        columns = [
+            map(bool, column) if self.codes[name] == "?" else column
+            for name, column in self.columns.items()
+        ]
+
+        rows = zip(*columns) if columns else itertools.repeat((), self.count)
+
+        names = tuple(self.columns)
+
+        # columns of a different field order are loaded by their names
+        if names == tuple(name for name, _ in self.fields(model)):
+            return list(map(model.load_values, rows))
+
+        return [model.load(dict(zip(names, row))) for row in rows]
+
+    def arrays(self) -> dict[str, Column]:
+        """
+        Converts the number columns into numpy arrays, sharing their memory.
+
+        :return: The columns, with the str and bytes columns as lists.
+        """
+
+        import numpy
+
+        return {
+            name: (
+                column if self.codes[name] in ("s", "y") else
+                numpy.frombuffer(
+                    column,
+                    dtype=bool if self.codes[name] == "?" else column.typecode
+                )
+            )
+            for name, column in self.columns.items()
+        }
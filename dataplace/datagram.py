@@ -0,0 +1,65 @@
+# datagram.py
+
+import struct
+
+__all__ = [
+    "pack_datagram",
+    "unpack_datagram",
+    "DATAGRAM_HEADER",
+    "DATAGRAM_LENGTH",
+    "DATAGRAM_MTU",
+    "DATAGRAM_LIMIT"
+]
+
+DATAGRAM_MAGIC = 0xDA
+
+# magic, sender session, sequence number, number of packed records
+DATAGRAM_HEADER = struct.Struct("!BIQH")
+DATAGRAM_LENGTH = struct.Struct("!H")
+
+# ethernet MTU without the IPv4 and UDP headers
+DATAGRAM_MTU = 1472
+DATAGRAM_LIMIT = 65507
+
+def pack_datagram(session: int, sequence: int, packets: list[bytes]) -> bytes:
+
+    header = DATAGRAM_HEADER.pack(
+        DATAGRAM_MAGIC, session, sequence, len(packets)
+    )
+
+    return b"".join(
+        [header] +
+        [
+            part
+            for packet in packets
+            for part in (DATAGRAM_LENGTH.pack(len(packet)), packet)
+        ]
+    )
+
+def unpack_datagram(datagram: bytes) -> tuple[int, int, list[bytes]]:
+
+    if len(datagram) < DATAGRAM_HEADER.size:
+        raise ValueError(f"Datagram of {len(datagram)} bytes is too short.")
+
+    magic, session, sequence, count = DATAGRAM_HEADER.unpack_from(datagram, 0)
+
+    if magic != DATAGRAM_MAGIC:
+        raise ValueError(f"Invalid datagram magic byte: {magic}.")
+
+    packets = []
+    offset = DATAGRAM_HEADER.size
+
+    for _ in range(count):
+        if offset + DATAGRAM_LENGTH.size > len(datagram):
+            raise ValueError("Datagram is truncated.")
+
+        size = DATAGRAM_LENGTH.unpack_from(datagram, offset)[0]
+        offset += DATAGRAM_LENGTH.size
+
+        if offset + size > len(datagram):
+            raise ValueError("Datagram is truncated.")
+
+        packets.append(datagram[offset:offset + size])
+        offset += size
+
+    return session, sequence, packets
@@ -0,0 +1,211 @@
+# dedupe.py
+
+import math
+import operator
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Callable, Hashable
+
+from dataplace.callback import Callback, Data
+
+__all__ = [
+    "Dedupe",
+    "RecentKeys",
+    "RotatingBloomFilter"
+]
+
+class RecentKeys:
+    """A set of the most recently seen keys, bounded by a capacity."""
+
+    def __init__(self, capacity: int) -> None:
+
+        self.capacity = capacity
+
+        self.keys: OrderedDict[Hashable, None] = OrderedDict()
+
+    def __len__(self) -> int:
+
+        return len(self.keys)
+
+    def __contains__(self, key: Hashable) -> bool:
+
+        return key in self.keys
+
+    def seen(self, key: Hashable) -> bool:
+        """
+        Adds a key, evicting the least recently seen one when full.
+
+        :param key: The key to add.
+
+        :return: The value of the key being already present.
+        """
+
+        keys = self.keys
+
+        if key in keys:
+            keys.move_to_end(key)
+
+            return True
+
+        keys[key] = None
+
+        if len(keys) > self.capacity:
+            keys.popitem(last=False)
+
+        return False
+
+    def clear(self) -> None:
+
+        self.keys.clear()
+
+class RotatingBloomFilter:
+    """
+    Two generations of bloom filters, of half the capacity each.
+
+    Keys are added to the current generation, and looked up in both.
+    Once the current generation holds half of the capacity, the older
+    one is dropped and a new one is started, so the memory is constant,
+    and the last half of the capacity of keys is always remembered,
+    with at most the given false positive rate for each generation.
+    """
+
+    def __init__(self, capacity: int, error: float = 0.001) -> None:
+
+        if not 0 < error < 1:
+            raise ValueError(f"Error rate must be in (0, 1), not {error}.")
+
+        self.capacity = capacity
+        self.error = error
+
+        self.generation = max(capacity // 2, 1)
+
+        self.bits = max(
+            int(-self.generation * math.log(error) / math.log(2) ** 2), 8
+        )
+        self.hashes = max(round(self.bits / self.generation * math.log(2)), 1)
+
+        self.current = bytearray((self.bits + 7) // 8)
+        self.previous = bytearray(len(self.current))
+        self.count = 0
+
+    def __len__(self) -> int:
+
+        return self.count
+
+    def positions(self, key: Hashable) -> list[int]:
+
+        # the filters are never shared between processes,
+        # so the salted builtin hash is enough for double hashing
+        first = hash(key)
+        second = hash((key, self.bits)) | 1
+        bits = self.bits
+
+        return [
+            (first + index * second) % bits for index in range(self.hashes)
+        ]
+
+    @staticmethod
+    def contains(bits: bytearray, positions: list[int]) -> bool:
+
+        for position in positions:
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+
+        return True
+
+    def __contains__(self, key: Hashable) -> bool:
+
+        positions = self.positions(key)
+
+        return (
+            self.contains(self.current, positions) or
+            self.contains(self.previous, positions)
+        )
+
+    def seen(self, key: Hashable) -> bool:
+        """
+        Adds a key, rotating the generations when the current one is full.
+
+        :param key: The key to add.
+
+        :return: The value of the key being probably already present.
+        """
+
+        positions = self.positions(key)
+
+        if self.contains(self.current, positions):
+            return True
+
+        found = self.contains(self.previous, positions)
+
+        if self.count >= self.generation:
+            self.previous = self.current
+            self.current = bytearray(len(self.previous))
+            self.count = 0
+
+        current = self.current
+
+        for position in positions:
+            current[position >> 3] |= 1 << (position & 7)
+
+        self.count += 1
+
+        return found
+
+    def clear(self) -> None:
+
+        self.current = bytearray(len(self.current))
+        self.previous = bytearray(len(self.current))
+        self.count = 0
+
+@dataclass
+class Dedupe(Callback):
+    """
+    A callback that skips the records with an already seen key.
+
+    The key is the name of a record attribute, like an id, or a function
+    of the record. The seen keys are kept in a set of the most recent
+    keys up to the capacity, or, with an error rate, in a rotating bloom
+    filter of a constant size, which may skip a new record with about
+    that probability. The nested callbacks and the callback itself are
+    only executed for the first record of each key, so records delivered
+    more than once, after a resumed connection or from many upstreams,
+    are only applied once.
+    """
+
+    key: str | Callable[[Data], Hashable] = "id"
+    capacity: int = 100_000
+    error: float | None = None
+
+    duplicates: int = 0
+    keys: RecentKeys | RotatingBloomFilter = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+
+        if isinstance(self.key, str):
+            self.key = operator.attrgetter(self.key)
+
+        if self.error is None:
+            self.keys = RecentKeys(self.capacity)
+
+        else:
+            self.keys = RotatingBloomFilter(self.capacity, self.error)
+
+    def first(self, data: Data) -> bool:
+
+        if self.keys.seen(self.key(data)):
+            self.duplicates += 1
+
+            return False
+
+        return True
+
+    async def async_execute(self, data: Data) -> None:
+
+        if isinstance(data, tuple(self.types)) and self.first(data):
+            await super().async_execute(data)
+
+    def execute(self, data: Data) -> None:
+
+        if isinstance(data, tuple(self.types)) and self.first(data):
+            super().execute(data)
@@ -0,0 +1,205 @@
+# frame.py
+
+import json
+import struct
+import asyncio
+from dataclasses import dataclass
+
+from dataplace.io import ModelIO
+from dataplace.codec import StructCodec, STRUCT_MAGIC, STRUCT_HEADER
+from dataplace.columns import ColumnBatch, COLUMNS_MAGIC, COLUMNS_HEADER
+
+__all__ = [
+    "Frame",
+    "FRAME_HEADER",
+    "FRAME_MAGIC",
+    "CREDIT_GRANT",
+    "read_frame",
+    "parse_frame",
+    "credit_frame",
+    "parse_credit",
+    "payload_type",
+    "encode",
+    "decode"
+]
+
+FRAME_MAGIC = 0xDB
+
+# magic, kind, flags, payload length, sequence number.
+# the header has the size of the legacy 16 digits length prefix, and the
+# magic byte is never an ascii digit, so both framings can share a stream.
+FRAME_HEADER = struct.Struct("!BBHIQ")
+
+# granted frames, granted payload bytes, where -1 means unlimited
+CREDIT_GRANT = struct.Struct("!qq")
+
+# the type label is the last key of a labeled dump
+TYPE_MARKER = json.dumps(ModelIO.TYPE).encode() + b': "'
+
+# the first bytes of a record encoded into a struct row, and of a batch
+# encoded into columns, both followed by the length of the type label
+LABELED_HEADERS = {
+    STRUCT_MAGIC: STRUCT_HEADER.size,
+    COLUMNS_MAGIC: COLUMNS_HEADER.size
+}
+
+STRUCT_PREFIX = bytes((STRUCT_MAGIC,))
+COLUMNS_PREFIX = bytes((COLUMNS_MAGIC,))
+
+@dataclass(slots=True, frozen=True)
+class Frame:
+    """A framed payload with a kind and a sequence number."""
+
+    DATA = 0
+    SESSION = 1
+    RESUME = 2
+    HEARTBEAT = 3
+    SUBSCRIBE = 4
+    CREDIT = 5
+
+    payload: bytes = b""
+    sequence: int = 0
+    kind: int = DATA
+    flags: int = 0
+
+    def pack(self) -> bytes:
+
+        return FRAME_HEADER.pack(
+            FRAME_MAGIC, self.kind, self.flags,
+            len(self.payload), self.sequence
+        ) + self.payload
+
+async def read_frame(reader: asyncio.StreamReader) -> Frame | None:
+    """
+    Reads the next frame from the stream.
+
+    :param reader: The data reader.
+
+    :return: The frame, or None when the stream has ended.
+    """
+
+    try:
+        header = await reader.readexactly(FRAME_HEADER.size)
+
+    except asyncio.IncompleteReadError as error:
+        if not error.partial:
+            return None
+
+        raise
+
+    if header[0] != FRAME_MAGIC:
+        return Frame(payload=await reader.readexactly(int(header)))
+
+    _, kind, flags, length, sequence = FRAME_HEADER.unpack(header)
+
+    return Frame(
+        payload=await reader.readexactly(length),
+        sequence=sequence,
+        kind=kind,
+        flags=flags
+    )
+
+def parse_frame(message: bytes | str) -> Frame:
+    """
+    Parses a whole message, as received from a websocket.
+
+    :param message: The message.
+
+    :return: The frame.
+    """
+
+    if isinstance(message, str):
+        message = message.encode()
+
+    if not message or message[0] != FRAME_MAGIC:
+        return Frame(payload=message)
+
+    _, kind, flags, length, sequence = FRAME_HEADER.unpack_from(message, 0)
+
+    return Frame(
+        payload=message[FRAME_HEADER.size:FRAME_HEADER.size + length],
+        sequence=sequence,
+        kind=kind,
+        flags=flags
+    )
+
+def credit_frame(frames: int = None, size: int = None) -> Frame:
+    """
+    Creates a frame granting the sender more frames and bytes to send.
+
+    :param frames: The number of frames, or None for no frame limit.
+    :param size: The number of payload bytes, or None for no byte limit.
+
+    :return: The credit frame.
+    """
+
+    return Frame(
+        payload=CREDIT_GRANT.pack(
+            -1 if frames is None else frames, -1 if size is None else size
+        ),
+        kind=Frame.CREDIT
+    )
+
+def parse_credit(frame: Frame) -> tuple[int | None, int | None]:
+
+    frames, size = CREDIT_GRANT.unpack(frame.payload)
+
+    return (None if frames < 0 else frames), (None if size < 0 else size)
+
+def payload_type(payload: bytes) -> str | None:
+    """
+    Finds the model type name of an encoded record without decoding it.
+
+    :param payload: The encoded record.
+
+    :return: The type name, or None when the payload has no type label.
+    """
+
+    if payload and payload[0] in LABELED_HEADERS:
+        start = LABELED_HEADERS[payload[0]]
+
+        return payload[start:start + payload[1]].decode()
+
+    start = payload.rfind(TYPE_MARKER)
+
+    if start < 0:
+        return None
+
+    start += len(TYPE_MARKER)
+    end = payload.find(b'"', start)
+
+    return None if end < 0 else payload[start:end].decode()
+
+def encode(data: ModelIO) -> bytes:
+    """
+    Encodes a record into a payload, as a struct row or as json.
+
+    :param data: The record.
+
+    :return: The payload.
+    """
+
+    if data.__struct__:
+        return StructCodec.of(type(data)).encode(data)
+
+    return json.dumps(data.labeled_dump()).encode()
+
+def decode(data: bytes) -> ModelIO | ColumnBatch:
+    """
+    Decodes a payload of any encoding, by its first byte.
+
+    :param data: The payload.
+
+    :return: The record, or the batch of records.
+    """
+
+    # an empty payload falls through to json, which rejects it
+    magic = data[:1]
+
+    if magic == STRUCT_PREFIX:
+        return StructCodec.load(data)
+
+    if magic == COLUMNS_PREFIX:
+        return ColumnBatch.decode(data)
+
+    return ModelIO.labeled_load(json.loads(data.decode()))
@@ -1,13 +1,22 @@
 # io.py
 
-from typing import Self, overload, ClassVar
+from typing import Self, overload, ClassVar, Callable
 from abc import ABCMeta
+import dataclasses
+import typing
+import types
 
 __all__ = [
     "ModelIO",
-    "getattrs"
+    "getattrs",
+    "slot_fields",
+    "dump_value",
+    "load_value"
 ]
 
+# slots of the instance machinery, which are never attributes
+SPECIAL_SLOTS = frozenset(("__weakref__", "__dict__"))
+
 def getattrs(obj: object, /) -> dict[str, ...]:
 
     data = {}
@@ -17,6 +26,7 @@ def getattrs(obj: object, /) -> dict[str, ...]:
             {
                 attribute: getattr(obj, attribute)
                 for attribute in obj.__slots__
+                if attribute not in SPECIAL_SLOTS
             }
         )
 
@@ -25,58 +35,657 @@ def getattrs(obj: object, /) -> dict[str, ...]:
 
     return data
 
+def slot_fields(cls: type) -> list[dataclasses.Field] | None:
+    """
+    Finds the fields of a dataclass whose instances have no dict.
+
+    :param cls: The class.
+
+    :return: The fields, or None for any other class.
+    """
+
+    if not dataclasses.is_dataclass(cls) or cls.__dictoffset__:
+        return None
+
+    return list(dataclasses.fields(cls))
+
+# values of these types are never nested models
+SCALARS = frozenset((int, float, str, bytes, bool, type(None)))
+
+Converter = Callable[[object], object]
+
+def dump_value(value: object, /) -> object:
+    """
+    Dumps a value of an unknown type, labeling any nested model.
+
+    :param value: The value.
+
+    :return: The dumped value.
+    """
+
+    if type(value) in SCALARS:
+        return value
+
+    if isinstance(value, ModelIO):
+        return value.labeled_dump()
+
+    if isinstance(value, (list, tuple)):
+        return [dump_value(item) for item in value]
+
+    if isinstance(value, dict):
+        return {key: dump_value(item) for key, item in value.items()}
+
+    return value
+
+def load_value(value: object, /) -> object:
+    """
+    Loads a value of an unknown type, loading any labeled nested model.
+
+    :param value: The dumped value.
+
+    :return: The value.
+    """
+
+    if type(value) in SCALARS:
+        return value
+
+    if isinstance(value, dict):
+        if ModelIO.TYPE in value:
+            return ModelIO.labeled_load(value)
+
+        return {key: load_value(item) for key, item in value.items()}
+
+    if isinstance(value, list):
+        return [load_value(item) for item in value]
+
+    return value
+
+def model_converter(model: type["ModelIO"]) -> tuple[Converter, Converter]:
+
+    def dump(value: object) -> object:
+
+        if isinstance(value, ModelIO):
+            return value.labeled_dump()
+
+        return value
+
+    def load(value: object) -> object:
+
+        if type(value) is not dict:
+            return value
+
+        if model.TYPE in value:
+            return ModelIO.labeled_load(value)
+
+        return model.load(value)
+
+    return dump, load
+
+def sequence_converter(
+        inner: tuple[Converter, Converter], factory: type = list
+) -> tuple[Converter, Converter]:
+
+    dump_item, load_item = inner
+
+    def dump(value: object) -> object:
+
+        if value is None:
+            return None
+
+        return [dump_item(item) for item in value]
+
+    def load(value: object) -> object:
+
+        if value is None:
+            return None
+
+        items = [load_item(item) for item in value]
+
+        return items if factory is list else factory(items)
+
+    return dump, load
+
+def mapping_converter(
+        inner: tuple[Converter, Converter]
+) -> tuple[Converter, Converter]:
+
+    dump_item, load_item = inner
+
+    def dump(value: object) -> object:
+
+        if value is None:
+            return None
+
+        return {key: dump_item(item) for key, item in value.items()}
+
+    def load(value: object) -> object:
+
+        if value is None:
+            return None
+
+        return {key: load_item(item) for key, item in value.items()}
+
+    return dump, load
+
+def converter(annotation: object) -> tuple[Converter, Converter] | None:
+    """
+    Creates the dump and load functions of the values of a type.
+
+    Models are dumped with their label, so a field of a base model
+    type loads any of its subclasses. Lists, tuples and dicts of models
+    convert each item, unions of a model with other types and untyped
+    containers are converted by inspecting each value, and any other
+    type is left as it is.
+
+    :param annotation: The type annotation of the values.
+
+    :return: The dump and load functions, or None for plain values.
+    """
+
+    if isinstance(annotation, type) and annotation in SCALARS:
+        return None
+
+    if (
+        annotation is typing.Any or annotation in (object, list, tuple, dict) or
+        isinstance(annotation, (str, typing.ForwardRef))
+    ):
+        return dump_value, load_value
+
+    if isinstance(annotation, type):
+        if issubclass(annotation, ModelIO):
+            return model_converter(annotation)
+
+        return None
+
+    origin = typing.get_origin(annotation)
+    args = typing.get_args(annotation)
+
+    if origin is typing.Annotated:
+        return converter(args[0])
+
+    if origin in (typing.Union, types.UnionType):
+        options = [arg for arg in args if arg is not type(None)]
+
+        # every converter passes None as it is
+        if len(options) == 1:
+            return converter(options[0])
+
+        if any(converter(option) is not None for option in options):
+            return dump_value, load_value
+
+        return None
+
+    if origin is list and args:
+        inner = converter(args[0])
+
+        return None if inner is None else sequence_converter(inner)
+
+    if origin is tuple and args:
+        if len(args) == 2 and args[1] is Ellipsis:
+            inner = converter(args[0])
+
+            return None if inner is None else sequence_converter(inner, tuple)
+
+        if any(converter(arg) is not None for arg in args):
+            return dump_value, load_value
+
+        return None
+
+    if origin is dict and len(args) == 2:
+        inner = converter(args[1])
+
+        return None if inner is None else mapping_converter(inner)
+
+    return None
+
+def field_converters(cls: type) -> dict[str, tuple[Converter, Converter]]:
+    """
+    Analyzes the field types of a dataclass once.
+
+    :param cls: The class.
+
+    :return: The dump and load functions of the fields with nested models.
+    """
+
+    converters = cls.__dict__.get("__converters__")
+
+    if converters is not None:
+        return converters
+
+    converters = {}
+
+    if dataclasses.is_dataclass(cls):
+        try:
+            hints = typing.get_type_hints(cls, localns={cls.__name__: cls})
+
+        except (NameError, TypeError):
+            hints = {}
+
+        for field in dataclasses.fields(cls):
+            functions = converter(hints.get(field.name, field.type))
+
+            if functions is not None:
+                converters[field.name] = functions
+
+    cls.__converters__ = converters
+
+    return converters
+
+def compile_dumper(
+        cls: type, positional: bool = False
+) -> Callable[[object], dict[str, ...] | tuple]:
+    """
+    Creates the dump function of a class.
+
+    The dump of a slotted dataclass is generated as a single dict
+    display of its fields, and any other class is dumped by reflection.
+    A positional dump is a tuple of the fields of a dataclass, in their
+    definition order, or of the attributes of any other class. Fields
+    holding nested models are dumped by their converters.
+
+    :param cls: The class.
+    :param positional: The value to dump into a tuple.
+
+    :return: The function from an instance to its attributes.
+    """
+
+    converters = field_converters(cls)
+
+    namespace = {
+        f"dump_{index}": converters[name][0]
+        for index, name in enumerate(converters)
+    }
+    names = {name: index for index, name in enumerate(converters)}
+
+    def value(name: str) -> str:
+
+        if name in names:
+            return f"dump_{names[name]}(obj.{name})"
+
+        return f"obj.{name}"
+
+    if positional:
+        if not dataclasses.is_dataclass(cls):
+            return lambda obj: tuple(getattrs(obj).values())
+
+        return eval(
+            "lambda obj: (" + "".join(
+                f"{value(field.name)}, " for field in dataclasses.fields(cls)
+            ) + ")",
+            namespace
+        )
+
+    fields = slot_fields(cls)
+
+    if fields is None:
+        if not converters:
+            return getattrs
+
+        def dump(obj: object) -> dict[str, ...]:
+
+            data = getattrs(obj)
+
+            for name, (function, _) in converters.items():
+                if name in data:
+                    data[name] = function(data[name])
+
+            return data
+
+        return dump
+
+    return eval(
+        "lambda obj: {" + ", ".join(
+            f"{field.name!r}: {value(field.name)}" for field in fields
+        ) + "}",
+        namespace
+    )
+
+def compile_fallback(
+        cls: type, positional: bool = False, start: int = 0
+) -> Callable[[...], object]:
+    """
+    Creates the load function of a class through its init.
+
+    :param cls: The class.
+    :param positional: The value to load from a sequence.
+    :param start: The index of the first field in a sequence.
+
+    :return: The function from the attributes to an instance.
+    """
+
+    if not dataclasses.is_dataclass(cls):
+        if positional:
+            # noinspection PyArgumentList
+            return lambda data: cls(*data[start:])
+
+        # noinspection PyArgumentList
+        return lambda data: cls(**data)
+
+    converters = {
+        name: functions[1]
+        for name, functions in field_converters(cls).items()
+    }
+    fields = dataclasses.fields(cls)
+    init = {field.name for field in fields if field.init}
+
+    if converters or len(init) < len(fields):
+        def keyed(data: dict[str, ...]) -> object:
+
+            # noinspection PyArgumentList
+            return cls(
+                **{
+                    key: (
+                        converters[key](value)
+                        if key in converters else value
+                    )
+                    for key, value in data.items() if key in init
+                }
+            )
+
+    else:
+        # noinspection PyArgumentList
+        keyed = lambda data: cls(**data)
+
+    if not positional:
+        return keyed
+
+    names = [field.name for field in fields]
+
+    return lambda data: keyed(dict(zip(names, data[start:])))
+
+def compile_builder(
+        cls: type,
+        fallback: Callable[[...], object] = None,
+        positional: bool = False,
+        start: int = 0
+) -> Callable[[...], object]:
+    """
+    Creates the load function of a class.
+
+    A slotted dataclass, frozen or not, whose fields are all set by its
+    init and that has no post init, is loaded by setting the slots of a
+    new instance directly, without calling the init. The data is trusted
+    to hold every field, and any other key is ignored. Data with a
+    missing field, or any other class, is loaded by the fallback, which
+    calls the init by default. Fields holding nested models are loaded
+    by their converters, once every field has been read, so a missing
+    field of a nested model is raised instead of falling back.
+
+    A positional load reads the fields from a sequence in their
+    definition order, beginning at the start index.
+
+    :param cls: The class.
+    :param fallback: The function to load any other data.
+    :param positional: The value to load from a sequence.
+    :param start: The index of the first field in a sequence.
+
+    :return: The function from the attributes to an instance.
+    """
+
+    if fallback is None:
+        fallback = compile_fallback(cls, positional=positional, start=start)
+
+    fields = slot_fields(cls)
+
+    if (
+        fields is None or hasattr(cls, "__post_init__") or
+        not all(field.init for field in fields)
+    ):
+        return fallback
+
+    converters = field_converters(cls)
+
+    namespace = {
+        "new": object.__new__,
+        "cls": cls,
+        "fallback": fallback,
+        **{
+            f"set_{index}": getattr(cls, field.name).__set__
+            for index, field in enumerate(fields)
+        },
+        **{
+            f"load_{index}": converters[field.name][1]
+            for index, field in enumerate(fields)
+            if field.name in converters
+        }
+    }
+
+    reads = []
+    loads = []
+
+    for index, field in enumerate(fields):
+        key = str(index + start) if positional else repr(field.name)
+
+        # only the reads fall back, so errors of nested loads are raised
+        if field.name in converters:
+            reads.append(f"value_{index} = data[{key}]")
+            loads.append(f"set_{index}(obj, load_{index}(value_{index}))")
+
+        else:
+            reads.append(f"set_{index}(obj, data[{key}])")
+
+    exec(
+        "def build(data):\n"
+        "    obj = new(cls)\n"
+        "    try:\n" + "".join(
+            f"        {line}\n" for line in reads
+        ) +
+        "    except LookupError:\n"
+        "        return fallback(data)\n" + "".join(
+            f"    {line}\n" for line in loads
+        ) +
+        "    return obj\n",
+        namespace
+    )
+
+    return namespace["build"]
+
 class ModelIO(metaclass=ABCMeta):
 
+    # lets slotted subclasses have no instance dict,
+    # while their records can still be weakly referenced
+    __slots__ = ("__weakref__",)
+
     TYPES: ClassVar[dict[str, [type["ModelIO"]]]] = {}
     TYPE: ClassVar[str] = "__type__"
     __model__: ClassVar[str | None] = None
 
+    # encodes the records into fixed struct rows instead of json
+    __struct__: ClassVar[bool] = False
+
+    # the compiled constructors of the labels, by the keys and by position
+    LOADERS: ClassVar[dict[str, Callable[[dict[str, ...]], "ModelIO"]]] = {}
+    VALUE_LOADERS: ClassVar[dict[str, Callable[[tuple], "ModelIO"]]] = {}
+
+    # compiled on the first use, once the class is complete
+    __dumper__: ClassVar[Callable[[Self], dict[str, ...]] | None] = None
+    __builder__: ClassVar[Callable[[dict[str, ...]], Self] | None] = None
+    __value_dumper__: ClassVar[Callable[[Self], tuple] | None] = None
+    __value_builder__: ClassVar[Callable[[tuple], Self] | None] = None
+    __converters__: ClassVar[dict[str, tuple[Callable, Callable]] | None] = None
+
     def __init_subclass__(cls, **kwargs) -> object:
 
-        cls.TYPES.setdefault(
-            cls.__model__ or cls.__name__, []
-        ).insert(0, cls)
+        label = cls.__model__ or cls.__name__
+
+        cls.TYPES.setdefault(label, []).insert(0, cls)
+
+        # the label now constructs the new class
+        cls.LOADERS.pop(label, None)
+        cls.VALUE_LOADERS.pop(label, None)
+
+        # a dataclass decorator only adds the fields, or creates a new
+        # slotted class, after the class has been created
+        cls.__dumper__ = None
+        cls.__builder__ = None
+        cls.__value_dumper__ = None
+        cls.__value_builder__ = None
+        cls.__converters__ = None
 
         return super().__init_subclass__(**kwargs)
 
     @classmethod
-    def labeled_load(cls, data: dict[str, ...]) -> Self:
+    def labeled_loader(
+            cls, label: str | None, positional: bool = False
+    ) -> Callable[[dict[str, ...] | tuple], Self]:
+        """
+        Finds the compiled constructor of a type label.
+
+        The constructor loads the labeled data of the latest class of the
+        label, without copying or changing the data, and is compiled once
+        for each label, unless the class overrides its load methods.
+
+        :param label: The type label of the data.
+        :param positional: The value to load from a labeled sequence.
+
+        :return: The function from the labeled data to an instance.
+        """
+
+        loaders = cls.VALUE_LOADERS if positional else cls.LOADERS
 
-        if cls.TYPE not in data:
+        loader = loaders.get(label)
+
+        if loader is not None:
+            return loader
+
+        if label is None:
             raise KeyError(
                 f"{cls.TYPE} must be present in a labeled "
                 f"JSON data of a {ModelIO} subclass."
             )
 
-        model_type = data.pop(cls.TYPE)
+        if label not in cls.TYPES:
+            raise KeyError(f"{label} is not recognized as a model type.")
 
-        if model_type not in cls.TYPES:
-            raise KeyError(
-                f"{model_type} is not recognized as a model type."
+        model = cls.TYPES[label][0]
+
+        if positional:
+            fallback = lambda values: model.load_values(values[1:])
+
+            compiled = (
+                model.load_values.__func__ is ModelIO.load_values.__func__
             )
 
-        e = None
+        else:
+            fallback = lambda data: model.load(
+                {key: value for key, value in data.items() if key != cls.TYPE}
+            )
+
+            compiled = model.load.__func__ is ModelIO.load.__func__
+
+        if compiled:
+            loader = compile_builder(
+                model, fallback, positional=positional, start=1
+            )
+
+        else:
+            loader = fallback
 
-        for base in cls.TYPES[model_type]:
-            return base.load(data)
+        loaders[label] = loader
 
-        raise e
+        return loader
+
+    @classmethod
+    def labeled_load(cls, data: dict[str, ...]) -> Self:
+
+        loader = cls.LOADERS.get(data.get(cls.TYPE))
+
+        if loader is None:
+            loader = cls.labeled_loader(data.get(cls.TYPE))
+
+        return loader(data)
+
+    @classmethod
+    def labeled_load_values(cls, values: tuple | list) -> Self:
+        """
+        Loads an instance from its label, followed by its field values.
+
+        :param values: The label and the values, in the field order.
+
+        :return: The instance.
+        """
+
+        label = values[0] if values else None
+
+        loader = cls.VALUE_LOADERS.get(label)
+
+        if loader is None:
+            loader = cls.labeled_loader(label, positional=True)
+
+        return loader(values)
 
     @classmethod
     def load(cls, data: dict[str, ...]) -> Self:
 
-        # noinspection PyArgumentList
-        return cls(**data)
+        builder = cls.__builder__
+
+        if builder is None:
+            builder = cls.__builder__ = compile_builder(cls)
+
+        return builder(data)
+
+    @classmethod
+    def load_values(cls, values: tuple | list) -> Self:
+        """
+        Loads an instance from its field values.
+
+        :param values: The values, in the field order.
+
+        :return: The instance.
+        """
+
+        builder = cls.__value_builder__
+
+        if builder is None:
+            builder = cls.__value_builder__ = compile_builder(
+                cls, positional=True
+            )
+
+        return builder(values)
 
     def dump(self) -> dict[str, ...]:
 
-        return getattrs(self)
+        dumper = type(self).__dumper__
+
+        if dumper is None:
+            dumper = type(self).__dumper__ = compile_dumper(type(self))
+
+        return dumper(self)
+
+    def dump_values(self) -> tuple:
+        """
+        Dumps the field values of the instance, in the field order.
+
+        :return: The values.
+        """
+
+        dumper = type(self).__value_dumper__
+
+        if dumper is None:
+            dumper = type(self).__value_dumper__ = compile_dumper(
+                type(self), positional=True
+            )
+
+        return dumper(self)
+
+    def labeled_dump_values(self) -> tuple:
+        """
+        Dumps the label of the instance, followed by its field values.
+
+        :return: The label and the values.
+        """
+
+        cls = type(self)
+
+        return (cls.__model__ or cls.__name__, *self.dump_values())
 
     def labeled_dump(self) -> dict[str, ...]:
 
         data = self.dump()
 
-        data[self.TYPE] = type(self).__name__
+        cls = type(self)
+
+        data[self.TYPE] = cls.__model__ or cls.__name__
 
         return data
 
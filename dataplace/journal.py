@@ -0,0 +1,339 @@
+# journal.py
+
+import os
+import mmap
+import bisect
+import struct
+import threading
+from typing import Generator
+
+from dataplace.io import ModelIO
+from dataplace.columns import ColumnBatch
+from dataplace.frame import Frame, FRAME_HEADER, encode, decode
+from dataplace.control import Controller
+from dataplace.send import BaseSender
+
+__all__ = [
+    "Journal",
+    "JournalReader"
+]
+
+# sequence number, offset of the frame in the segment
+INDEX_ENTRY = struct.Struct("!QQ")
+
+SEGMENT_SUFFIX = ".journal"
+INDEX_SUFFIX = ".index"
+
+def segment_names(directory: str) -> list[int]:
+
+    if not os.path.exists(directory):
+        return []
+
+    return sorted(
+        int(name[:-len(SEGMENT_SUFFIX)])
+        for name in os.listdir(directory)
+        if name.endswith(SEGMENT_SUFFIX)
+    )
+
+def segment_path(directory: str, first: int, suffix: str) -> str:
+
+    return os.path.join(directory, f"{first:020d}{suffix}")
+
+class Journal:
+    """
+    An append-only journal of records, in segmented files of wire frames.
+
+    Each record is encoded into a sequenced frame with the wire framing,
+    and appended to the current segment, with an entry of its sequence
+    number and offset in the index file of the segment. A new segment is
+    started once the current one reaches the segment size.
+
+    The sync interval sets the group-commit policy. With None, flushing
+    to disk is left to the operating system. With 0, every write is
+    flushed and synced before returning. Otherwise, a background thread
+    syncs all the writes of the last interval together, so writing does
+    not wait for the disk.
+    """
+
+    SEGMENT = 2 ** 26
+
+    def __init__(
+            self,
+            directory: str,
+            segment: int = None,
+            sync: float = None
+    ) -> None:
+
+        self.directory = directory
+        self.segment = segment or self.SEGMENT
+        self.sync = sync
+
+        os.makedirs(directory, exist_ok=True)
+
+        self.sequence = JournalReader(directory).last
+        self.first = 0
+        self.size = 0
+        self.dirty = False
+
+        self.file = None
+        self.index = None
+
+        self.lock = threading.Lock()
+        self.event = threading.Event()
+        self.closed = False
+
+        self.syncer: threading.Thread | None = None
+
+        if sync:
+            self.syncer = threading.Thread(
+                target=self._syncing_loop, daemon=True
+            )
+            self.syncer.start()
+
+    def _open_segment(self) -> None:
+
+        self._close_segment()
+
+        self.first = self.sequence + 1
+        self.size = 0
+
+        self.file = open(
+            segment_path(self.directory, self.first, SEGMENT_SUFFIX), "ab"
+        )
+        self.index = open(
+            segment_path(self.directory, self.first, INDEX_SUFFIX), "ab"
+        )
+
+    def _close_segment(self) -> None:
+
+        if self.file is None:
+            return
+
+        self._flush(sync=self.sync is not None)
+
+        self.file.close()
+        self.index.close()
+
+        self.file = None
+        self.index = None
+
+    def _flush(self, sync: bool = True) -> None:
+
+        self.file.flush()
+        self.index.flush()
+
+        if sync:
+            os.fsync(self.file.fileno())
+            os.fsync(self.index.fileno())
+
+        self.dirty = False
+
+    def _syncing_loop(self) -> None:
+
+        while not self.closed:
+            self.event.wait(self.sync)
+            self.event.clear()
+
+            with self.lock:
+                if self.dirty and self.file is not None:
+                    self._flush()
+
+    def write(self, data: ModelIO) -> int:
+        """
+        Appends a record to the journal.
+
+        :param data: The record to write.
+
+        :return: The sequence number of the record.
+        """
+
+        return self.write_payload(encode(data))
+
+    def write_payload(self, payload: bytes) -> int:
+
+        with self.lock:
+            if self.closed:
+                raise ValueError("Cannot write to a closed journal.")
+
+            frame = Frame(payload=payload, sequence=self.sequence + 1).pack()
+
+            if self.file is None or (
+                self.size and self.size + len(frame) > self.segment
+            ):
+                self._open_segment()
+
+            self.file.write(frame)
+            self.index.write(INDEX_ENTRY.pack(self.sequence + 1, self.size))
+
+            self.sequence += 1
+            self.size += len(frame)
+            self.dirty = True
+
+            if self.sync == 0:
+                self._flush()
+
+            return self.sequence
+
+    def flush(self) -> None:
+
+        with self.lock:
+            if self.file is not None:
+                self._flush(sync=self.sync is not None)
+
+    def close(self) -> None:
+
+        with self.lock:
+            self.closed = True
+
+            self._close_segment()
+
+        self.event.set()
+
+        if self.syncer is not None:
+            self.syncer.join()
+
+class JournalReader:
+    """Reads ranges of a journal directory by memory mapping its segments."""
+
+    def __init__(self, directory: str) -> None:
+
+        self.directory = directory
+
+    @property
+    def segments(self) -> list[int]:
+
+        return segment_names(self.directory)
+
+    @property
+    def first(self) -> int:
+
+        segments = self.segments
+
+        return segments[0] if segments else 0
+
+    @property
+    def last(self) -> int:
+
+        for first in reversed(self.segments):
+            path = segment_path(self.directory, first, INDEX_SUFFIX)
+
+            count = os.path.getsize(path) // INDEX_ENTRY.size
+
+            if count:
+                return first + count - 1
+
+        return 0
+
+    def frames(
+            self, start: int = None, stop: int = None
+    ) -> Generator[Frame, ..., ...]:
+        """
+        Iterates over the frames of a range of sequence numbers.
+
+        :param start: The first sequence number.
+        :param stop: The sequence number to stop before.
+
+        :return: The frames in sequence order.
+        """
+
+        segments = self.segments
+
+        if not segments:
+            return
+
+        start = max(start or segments[0], segments[0])
+
+        position = max(bisect.bisect_right(segments, start) - 1, 0)
+
+        for first in segments[position:]:
+            if stop is not None and first >= stop:
+                return
+
+            path = segment_path(self.directory, first, SEGMENT_SUFFIX)
+
+            if not os.path.getsize(path):
+                continue
+
+            offset = 0
+
+            if start > first:
+                index_path = segment_path(self.directory, first, INDEX_SUFFIX)
+
+                with open(index_path, "rb") as index:
+                    index.seek((start - first) * INDEX_ENTRY.size)
+
+                    entry = index.read(INDEX_ENTRY.size)
+
+                if len(entry) < INDEX_ENTRY.size:
+                    continue
+
+                offset = INDEX_ENTRY.unpack(entry)[1]
+
+            with (
+                open(path, "rb") as file,
+                mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as memory
+            ):
+                while offset + FRAME_HEADER.size <= len(memory):
+                    _, kind, flags, length, sequence = (
+                        FRAME_HEADER.unpack_from(memory, offset)
+                    )
+
+                    if stop is not None and sequence >= stop:
+                        return
+
+                    offset += FRAME_HEADER.size
+
+                    if offset + length > len(memory):
+                        break
+
+                    yield Frame(
+                        payload=memory[offset:offset + length],
+                        sequence=sequence,
+                        kind=kind,
+                        flags=flags
+                    )
+
+                    offset += length
+
+    def records(
+            self, start: int = None, stop: int = None
+    ) -> Generator[ModelIO, ..., ...]:
+
+        for frame in self.frames(start=start, stop=stop):
+            data = decode(frame.payload)
+
+            # a batch frame holds the records of several calls
+            if type(data) is ColumnBatch:
+                yield from data.records()
+
+            else:
+                yield data
+
+    async def replay(
+            self,
+            target: Controller,
+            start: int = None,
+            stop: int = None
+    ) -> int:
+        """
+        Replays a range of the journal into a controller or a sender.
+
+        :param target: The controller to call, or the sender to send with.
+        :param start: The first sequence number.
+        :param stop: The sequence number to stop before.
+
+        :return: The number of replayed records.
+        """
+
+        count = 0
+
+        for record in self.records(start=start, stop=stop):
+            if isinstance(target, BaseSender):
+                await target.call(record)
+
+            else:
+                await target.async_callback(record)
+
+            count += 1
+
+        return count
@@ -1,21 +1,38 @@
 # receive.py
 
 from abc import ABCMeta, abstractmethod
+import sys
+import socket
 import asyncio
-import json
-
-# noinspection PyProtectedMember
-from websockets.legacy.server import serve, WebSocketServerProtocol, Serve
-# noinspection PyProtectedMember
-from websockets.legacy.client import connect, Connect, WebSocketClientProtocol
+import threading
+import heapq
+import operator
+from collections import deque
+from typing import Iterable, Callable, TYPE_CHECKING
+
+# the websocket transports are imported when they are first connected
+if TYPE_CHECKING:
+    # noinspection PyProtectedMember
+    from websockets.legacy.server import WebSocketServerProtocol, Serve
+    # noinspection PyProtectedMember
+    from websockets.legacy.client import Connect, WebSocketClientProtocol
 
 from dataplace.io import ModelIO
+from dataplace.columns import ColumnBatch
+from dataplace.ring import SharedRing, RingReader, RingWaiter
+from dataplace.frame import (
+    Frame, FRAME_HEADER, FRAME_MAGIC, read_frame, parse_frame, credit_frame,
+    decode
+)
+from dataplace.unix import clear_socket, socket_identity, remove_socket
+from dataplace.datagram import unpack_datagram
 from dataplace.callback import Callback
 from dataplace.base import BaseCommunicator
 from dataplace.control import Controller
 from dataplace.handler import Handler
 
 __all__ = [
+    "ReceiverSequence",
     "ReceiverSocket",
     "ReceiverSocketServer",
     "ReceiverSocketClient",
@@ -24,19 +41,25 @@ __all__ = [
     "ReceiverClient",
     "ReceiverServer",
     "ReceiverWebSocket",
+    "ReceiverUnix",
+    "ReceiverUnixServer",
+    "ReceiverUnixClient",
+    "ReceiverSharedMemoryClient",
+    "ReceiverDatagramServer",
+    "ReceiverMergeClient",
+    "FrameCollector",
     "BaseReceiver",
     "decode",
     "Receiver"
 ]
 
-def decode(data: bytes) -> ModelIO:
-
-    return ModelIO.labeled_load(json.loads(data.decode()))
-
 class BaseReceiver(BaseCommunicator, metaclass=ABCMeta):
 
     DELAY = 0.0001
 
+    # passes column batches to the callbacks as they are
+    columns: bool = False
+
     def __init__(
             self,
             callbacks: list[Callback] = None,
@@ -70,6 +93,26 @@ class BaseReceiver(BaseCommunicator, metaclass=ABCMeta):
 
         await self.receive(**kwargs)
 
+    async def accept(self, payload: bytes) -> None:
+        """
+        Decodes a payload into the callbacks.
+
+        A column batch is passed as its records, one by one, or as it is
+        when receiving columns.
+
+        :param payload: The encoded record or batch.
+        """
+
+        data = decode(payload)
+
+        if type(data) is not ColumnBatch or self.columns:
+            await self.async_callback(data=data)
+
+            return
+
+        for record in data.records():
+            await self.async_callback(data=record)
+
 class ReceiverServer(BaseReceiver, metaclass=ABCMeta):
 
     pass
@@ -78,7 +121,113 @@ class ReceiverClient(BaseReceiver, metaclass=ABCMeta):
 
     pass
 
-class ReceiverSocket(BaseReceiver, metaclass=ABCMeta):
+class ReceiverSequence(BaseReceiver, metaclass=ABCMeta):
+    """
+    Tracks the session and sequence numbers of sequenced frames.
+
+    Frames at or below the last sequence number are dropped as
+    duplicates, and skipped sequence numbers are counted as gaps.
+    A raw receiver passes the frames to its callbacks without decoding.
+
+    With heartbeat, the receiver lets the sender know it is alive every
+    that many seconds, and with idle, a connection on which nothing has
+    been received for that many seconds is considered dead and closed.
+
+    With a window, the sender may only send that many frames, and with
+    a window size, that many payload bytes, ahead of the frames handled
+    by the callbacks, which are granted back to the sender as credit.
+    """
+
+    # the errors of a connection that has been lost or closed by the peer
+    DISCONNECTIONS = (
+        ConnectionError,
+        asyncio.TimeoutError,
+        asyncio.IncompleteReadError
+    )
+
+    raw: bool = False
+    heartbeat: float | None = None
+    idle: float | None = None
+    window: int | None = None
+    window_size: int | None = None
+
+    consumed: int = 0
+    consumed_size: int = 0
+
+    session: str = ""
+    sequence: int = 0
+    gaps: int = 0
+    duplicates: int = 0
+
+    async def process(self, frame: Frame) -> None:
+
+        if frame.kind == Frame.SESSION:
+            session = frame.payload.decode()
+
+            if session != self.session:
+                self.session = session
+                self.sequence = 0
+
+            return
+
+        if frame.kind != Frame.DATA:
+            return
+
+        await self.deliver(frame)
+
+        if self.window is not None or self.window_size is not None:
+            await self.consume(frame)
+
+    async def deliver(self, frame: Frame) -> None:
+
+        if frame.sequence:
+            if frame.sequence <= self.sequence:
+                self.duplicates += 1
+
+                return
+
+            if self.sequence and frame.sequence > self.sequence + 1:
+                self.gaps += 1
+
+            self.sequence = frame.sequence
+
+        if not frame.payload:
+            return
+
+        if self.raw:
+            await self.async_callback(data=frame)
+
+        else:
+            await self.accept(frame.payload)
+
+    async def consume(self, frame: Frame) -> None:
+        """
+        Counts a handled frame, granting the sender more credit for the
+        handled frames once half of the window has been handled.
+
+        :param frame: The handled frame.
+        """
+
+        self.consumed += 1
+        self.consumed_size += len(frame.payload)
+
+        if (
+            (self.window and self.consumed * 2 >= self.window) or
+            (self.window_size and self.consumed_size * 2 >= self.window_size)
+        ):
+            await self.grant(
+                None if self.window is None else self.consumed,
+                None if self.window_size is None else self.consumed_size
+            )
+
+            self.consumed = 0
+            self.consumed_size = 0
+
+    async def grant(self, frames: int = None, size: int = None) -> None:
+
+        pass
+
+class ReceiverSocket(ReceiverSequence, metaclass=ABCMeta):
 
     def __init__(
             self,
@@ -91,11 +240,19 @@ class ReceiverSocket(BaseReceiver, metaclass=ABCMeta):
             running: bool = True,
             enabled: bool = True,
             delay: float = None,
+            raw: bool = False,
+            columns: bool = False,
+            heartbeat: float = None,
+            idle: float = None,
             data: ... = None
     ) -> None:
 
         self.host = host
         self.port = port
+        self.raw = raw
+        self.columns = columns
+        self.heartbeat = heartbeat
+        self.idle = idle
 
         super().__init__(
             callbacks=callbacks,
@@ -118,21 +275,18 @@ class ReceiverSocket(BaseReceiver, metaclass=ABCMeta):
             self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
     ) -> None:
 
-        buffer_message = await reader.read(16)
-
-        if not buffer_message:
-            return
+        if self.idle is None:
+            frame = await read_frame(reader)
 
-        buffer = int(buffer_message)
+        else:
+            frame = await asyncio.wait_for(
+                read_frame(reader), timeout=self.idle
+            )
 
-        if not buffer:
+        if frame is None:
             return
 
-        data = await reader.read(buffer)
-
-        record = decode(data)
-
-        await self.async_callback(data=record)
+        await self.process(frame)
 
     async def _handling_loop(
             self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
@@ -145,26 +299,57 @@ class ReceiverSocket(BaseReceiver, metaclass=ABCMeta):
 
         self.controllers.append(controller)
 
-        while controller.running:
-            await asyncio.sleep(self.delay)
+        beating = None
 
-            while controller.paused:
-                continue
+        if self.heartbeat is not None:
+            beating = asyncio.create_task(self._beating_loop(writer))
 
-            with controller.handler:
-                await self.handle(reader=reader, writer=writer)
+        try:
+            while controller.running:
+                await asyncio.sleep(self.delay)
 
-            if controller.handler.caught and controller.handler.exit:
-                controller.running = False
+                while controller.paused:
+                    continue
 
-                break
+                with controller.handler:
+                    await self.handle(reader=reader, writer=writer)
+
+                if controller.handler.caught and controller.handler.exit:
+                    break
+
+                if reader.at_eof():
+                    break
+
+        except self.DISCONNECTIONS:
+            writer.transport.abort()
+
+        finally:
+            controller.running = False
+
+            if beating is not None:
+                beating.cancel()
+
+            if controller in self.controllers:
+                self.controllers.remove(controller)
+
+    async def _beating_loop(self, writer: asyncio.StreamWriter) -> None:
+
+        heartbeat = Frame(kind=Frame.HEARTBEAT).pack()
+
+        try:
+            while not writer.is_closing():
+                await asyncio.sleep(self.heartbeat)
+
+                writer.write(heartbeat)
+
+                await writer.drain()
 
-        if controller in self.controllers:
-            self.controllers.remove(controller)
+        except self.DISCONNECTIONS:
+            pass
 
 type WebSocket = WebSocketServerProtocol | WebSocketClientProtocol
 
-class ReceiverWebSocket(BaseReceiver, metaclass=ABCMeta):
+class ReceiverWebSocket(ReceiverSequence, metaclass=ABCMeta):
 
     def __init__(
             self,
@@ -176,10 +361,23 @@ class ReceiverWebSocket(BaseReceiver, metaclass=ABCMeta):
             running: bool = True,
             enabled: bool = True,
             delay: float = None,
+            raw: bool = False,
+            columns: bool = False,
+            heartbeat: float = None,
+            idle: float = None,
             data: ... = None
     ) -> None:
 
         self.url = url
+        self.raw = raw
+        self.columns = columns
+        self.heartbeat = heartbeat
+        self.idle = idle
+
+        from websockets.exceptions import ConnectionClosed
+
+        # websockets is only imported once a websocket transport is used
+        self.DISCONNECTIONS = (*self.DISCONNECTIONS, ConnectionClosed)
 
         super().__init__(
             callbacks=callbacks,
@@ -194,11 +392,7 @@ class ReceiverWebSocket(BaseReceiver, metaclass=ABCMeta):
 
     async def receive(self, websocket: WebSocket = None) -> None:
 
-        data = await websocket.recv()
-
-        record = decode(data)
-
-        await self.async_callback(data=record)
+        await self.process(parse_frame(await websocket.recv()))
 
     async def send(self, websocket: WebSocket = None) -> None:
 
@@ -210,35 +404,175 @@ class ReceiverWebSocket(BaseReceiver, metaclass=ABCMeta):
 
     async def _handling_loop(self, websocket: WebSocket = None) -> None:
 
-        while self.running:
-            await asyncio.sleep(self.delay)
+        try:
+            while self.running:
+                await asyncio.sleep(self.delay)
 
-            while self.paused:
-                continue
+                while self.paused:
+                    continue
+
+                await self.handle(websocket=websocket)
 
-            await self.handle(websocket=websocket)
+        except self.DISCONNECTIONS:
+            pass
+
+    def _ping_options(self) -> dict[str, float]:
+
+        # heartbeats and dead peers are handled by the websocket pings
+        options = {}
+
+        if self.heartbeat is not None:
+            options["ping_interval"] = self.heartbeat
+
+        if self.idle is not None:
+            options["ping_timeout"] = self.idle
+
+        return options
 
 class ReceiverSocketClient(ReceiverSocket, ReceiverClient):
+    """
+    Receives data from a socket sender server.
+
+    On every connection, the client asks the server to start sending,
+    after its subscription and credit, and with resume, to first
+    replay the frames it has missed since its last sequence number.
+    With reconnect, the client reconnects after that many seconds
+    whenever the connection is lost or refused. With a subscription,
+    the server only sends the records of the given model types, so the
+    sequence gaps also count the records of the other types.
+    """
 
     reader: asyncio.StreamReader | None = None
     writer: asyncio.StreamWriter | None = None
 
+    resume: bool = False
+    reconnect: float | None = None
+    subscription: Iterable[str | type[ModelIO]] | None = None
+
+    def __init__(
+            self,
+            host: str,
+            port: int,
+            resume: bool = False,
+            reconnect: float = None,
+            subscription: Iterable[str | type[ModelIO]] = None,
+            window: int = None,
+            window_size: int = None,
+            callbacks: list[Callback] = None,
+            controllers: list[Controller] = None,
+            handler: Handler = None,
+            paused: bool = False,
+            running: bool = True,
+            enabled: bool = True,
+            delay: float = None,
+            raw: bool = False,
+            columns: bool = False,
+            heartbeat: float = None,
+            idle: float = None,
+            data: ... = None
+    ) -> None:
+
+        self.resume = resume
+        self.reconnect = reconnect
+        self.subscription = subscription
+        self.window = window
+        self.window_size = window_size
+
+        super().__init__(
+            host=host,
+            port=port,
+            callbacks=callbacks,
+            paused=paused,
+            running=running,
+            enabled=enabled,
+            delay=delay,
+            raw=raw,
+            columns=columns,
+            heartbeat=heartbeat,
+            idle=idle,
+            controllers=controllers,
+            handler=handler,
+            data=data
+        )
+
     async def connect(self) -> None:
 
         self.reader, self.writer = await asyncio.open_connection(
             host=self.host, port=self.port
         )
 
-    async def start(self) -> None:
+    async def request(self) -> None:
+
+        # without resume, the request only tells the server to start sending
+        frame = Frame(
+            payload=self.session.encode() if self.resume else b"",
+            sequence=self.sequence + 1 if self.resume else 0,
+            kind=Frame.RESUME
+        )
 
-        await self.connect()
+        self.writer.write(frame.pack())
 
-        self.running = True
+        await self.writer.drain()
+
+    async def grant(self, frames: int = None, size: int = None) -> None:
+
+        self.writer.write(credit_frame(frames, size).pack())
+
+        await self.writer.drain()
+
+    async def subscribe(self) -> None:
 
-        await self._handling_loop(
-            reader=self.reader, writer=self.writer
+        names = (
+            name if isinstance(name, str) else
+            name.__model__ or name.__name__
+            for name in self.subscription
         )
 
+        frame = Frame(payload=",".join(names).encode(), kind=Frame.SUBSCRIBE)
+
+        self.writer.write(frame.pack())
+
+        await self.writer.drain()
+
+    async def start(self) -> None:
+
+        self.running = True
+
+        while self.running and not self.closed:
+            try:
+                await self._connect()
+
+            except OSError:
+                if self.reconnect is None:
+                    raise
+
+                await asyncio.sleep(self.reconnect)
+
+                continue
+
+            if self.subscription is not None:
+                await self.subscribe()
+
+            if self.window is not None or self.window_size is not None:
+                self.consumed = 0
+                self.consumed_size = 0
+
+                await self.grant(self.window, self.window_size)
+
+            # the server applies the subscription and credit before resuming
+            await self.request()
+
+            await self._handling_loop(
+                reader=self.reader, writer=self.writer
+            )
+
+            self._connected = False
+
+            if self.reconnect is None:
+                break
+
+            await asyncio.sleep(self.reconnect)
+
     async def close(self) -> None:
 
         self.writer.close()
@@ -246,35 +580,212 @@ class ReceiverSocketClient(ReceiverSocket, ReceiverClient):
         await self.writer.wait_closed()
 
 class ReceiverSocketServer(ReceiverSocket, ReceiverServer):
+    """
+    Receives data from socket senders.
+
+    With threads, accepted connections are handed round-robin to worker
+    threads that each run their own event loop, so reading and decoding
+    are spread across threads, while the callbacks are still executed
+    on the event loop the server was started on.
+    """
 
     server: asyncio.Server | None = None
+    listener: socket.socket | None = None
+    accepting: asyncio.Task | None = None
+    loop: asyncio.AbstractEventLoop | None = None
+    threads: int | None = None
 
-    async def connect(self) -> None:
+    def __init__(
+            self,
+            host: str,
+            port: int,
+            threads: int = None,
+            callbacks: list[Callback] = None,
+            controllers: list[Controller] = None,
+            handler: Handler = None,
+            paused: bool = False,
+            running: bool = True,
+            enabled: bool = True,
+            delay: float = None,
+            raw: bool = False,
+            columns: bool = False,
+            heartbeat: float = None,
+            idle: float = None,
+            data: ... = None
+    ) -> None:
+
+        self.threads = threads
+
+        self.loops: list[asyncio.AbstractEventLoop] = []
+        self.workers: list[threading.Thread] = []
+
+        super().__init__(
+            host=host,
+            port=port,
+            callbacks=callbacks,
+            paused=paused,
+            running=running,
+            enabled=enabled,
+            delay=delay,
+            raw=raw,
+            columns=columns,
+            heartbeat=heartbeat,
+            idle=idle,
+            controllers=controllers,
+            handler=handler,
+            data=data
+        )
+
+    async def async_callback(self, data: ModelIO) -> None:
+
+        if self.loop is None or asyncio.get_running_loop() is self.loop:
+            await super().async_callback(data)
+
+            return
 
-        self.server = await asyncio.start_server(
-            self._handling_loop, self.host, self.port
+        await asyncio.wrap_future(
+            asyncio.run_coroutine_threadsafe(
+                super().async_callback(data), self.loop
+            )
         )
 
+    @staticmethod
+    def _stop_loop(loop: asyncio.AbstractEventLoop) -> None:
+
+        for task in asyncio.all_tasks(loop):
+            task.cancel()
+
+        loop.call_soon(loop.stop)
+
+    async def _serving_loop(self, connection: socket.socket) -> None:
+
+        reader, writer = await asyncio.open_connection(sock=connection)
+
+        await self._handling_loop(reader=reader, writer=writer)
+
+    async def _accepting_loop(self) -> None:
+
+        index = 0
+
+        while self.running:
+            connection, _ = await self.loop.sock_accept(self.listener)
+
+            if self.draining:
+                connection.close()
+
+                continue
+
+            asyncio.run_coroutine_threadsafe(
+                self._serving_loop(connection),
+                self.loops[index % len(self.loops)]
+            )
+
+            index += 1
+
+    async def connect(self) -> None:
+
+        if not self.threads:
+            self.server = await asyncio.start_server(
+                self._handling_loop, self.host, self.port
+            )
+
+            return
+
+        self.loop = asyncio.get_running_loop()
+
+        self.listener = socket.create_server((self.host, self.port))
+        self.listener.setblocking(False)
+
+        for _ in range(self.threads):
+            loop = asyncio.new_event_loop()
+
+            worker = threading.Thread(target=loop.run_forever, daemon=True)
+            worker.start()
+
+            self.loops.append(loop)
+            self.workers.append(worker)
+
+    async def drained(self) -> None:
+
+        if self.listener is None:
+            self.server.close()
+
+        else:
+            self.running = False
+
+            # new connections are no longer accepted
+            if self.accepting is not None:
+                self.accepting.cancel()
+
+        await super().drained()
+
     async def close(self) -> None:
 
-        self.server.close()
+        if self.listener is None:
+            self.server.close()
+
+            if sys.version_info >= (3, 13):
+                self.server.close_clients()
+
+            await self.server.wait_closed()
+
+            return
+
+        self.running = False
 
-        await self.server.wait_closed()
+        if self.accepting is not None:
+            self.accepting.cancel()
+
+        for loop in self.loops:
+            loop.call_soon_threadsafe(self._stop_loop, loop)
+
+        running = asyncio.get_running_loop()
+
+        # the workers are joined without blocking the event loop
+        for worker in self.workers:
+            await running.run_in_executor(None, worker.join)
+
+        for loop in self.loops:
+            loop.close()
+
+        self.loops.clear()
+        self.workers.clear()
+
+        self.listener.close()
 
     async def start(self) -> None:
 
         await super().start()
 
+        if self.listener is not None:
+            self.accepting = asyncio.create_task(self._accepting_loop())
+
+            try:
+                await self.accepting
+
+            except asyncio.CancelledError:
+                # the accepting task is cancelled when the server stops
+                if asyncio.current_task().cancelling():
+                    raise
+
+            finally:
+                self.accepting = None
+
+            return
+
         async with self.server:
             await self.server.serve_forever()
 
 class ReceiverWebSocketClient(ReceiverWebSocket, ReceiverClient):
 
-    client: Connect | None = None
+    client: "Connect | None" = None
 
     async def connect(self) -> None:
 
-        self.client = connect(self.url)
+        # noinspection PyProtectedMember
+        from websockets.legacy.client import connect
+
+        self.client = connect(self.url, **self._ping_options())
 
     async def close(self) -> None:
 
@@ -289,7 +800,7 @@ class ReceiverWebSocketClient(ReceiverWebSocket, ReceiverClient):
 
 class ReceiverWebSocketServer(ReceiverWebSocket, ReceiverServer):
 
-    server: Serve | None = None
+    server: "Serve | None" = None
 
     def __init__(
             self,
@@ -303,6 +814,10 @@ class ReceiverWebSocketServer(ReceiverWebSocket, ReceiverServer):
             running: bool = True,
             enabled: bool = True,
             delay: float = None,
+            raw: bool = False,
+            columns: bool = False,
+            heartbeat: float = None,
+            idle: float = None,
             data: ... = None
     ) -> None:
 
@@ -317,6 +832,10 @@ class ReceiverWebSocketServer(ReceiverWebSocket, ReceiverServer):
             enabled=enabled,
             url=f"{protocol}://{host}:{port}",
             delay=delay,
+            raw=raw,
+            columns=columns,
+            heartbeat=heartbeat,
+            idle=idle,
             controllers=controllers,
             handler=handler,
             data=data
@@ -324,7 +843,19 @@ class ReceiverWebSocketServer(ReceiverWebSocket, ReceiverServer):
 
     async def connect(self) -> None:
 
-        self.server = serve(self._handling_loop, self.host, self.port)
+        # noinspection PyProtectedMember
+        from websockets.legacy.server import serve
+
+        self.server = serve(
+            self._handling_loop, self.host, self.port,
+            **self._ping_options()
+        )
+
+    async def drained(self) -> None:
+
+        self.server.ws_server.close(close_connections=False)
+
+        await super().drained()
 
     async def close(self) -> None:
 
@@ -339,14 +870,847 @@ class ReceiverWebSocketServer(ReceiverWebSocket, ReceiverServer):
         async with self.server:
             await asyncio.Future()
 
-class Receiver:
+class ReceiverUnix(ReceiverSocket, metaclass=ABCMeta):
 
-    class Socket:
+    def __init__(
+            self,
+            path: str,
+            callbacks: list[Callback] = None,
+            controllers: list[Controller] = None,
+            handler: Handler = None,
+            paused: bool = False,
+            running: bool = True,
+            enabled: bool = True,
+            delay: float = None,
+            raw: bool = False,
+            columns: bool = False,
+            heartbeat: float = None,
+            idle: float = None,
+            data: ... = None
+    ) -> None:
 
-        Server = ReceiverSocketServer
-        Client = ReceiverSocketClient
+        self.path = path
+        self.raw = raw
+        self.columns = columns
+        self.heartbeat = heartbeat
+        self.idle = idle
 
-    class WebSocket:
+        BaseReceiver.__init__(
+            self,
+            callbacks=callbacks,
+            paused=paused,
+            running=running,
+            enabled=enabled,
+            delay=delay,
+            controllers=controllers,
+            handler=handler,
+            data=data
+        )
 
-        Server = ReceiverWebSocketServer
-        Client = ReceiverWebSocketClient
+class ReceiverUnixClient(ReceiverUnix, ReceiverSocketClient):
+
+    def __init__(
+            self,
+            path: str,
+            resume: bool = False,
+            reconnect: float = None,
+            subscription: Iterable[str | type[ModelIO]] = None,
+            window: int = None,
+            window_size: int = None,
+            callbacks: list[Callback] = None,
+            controllers: list[Controller] = None,
+            handler: Handler = None,
+            paused: bool = False,
+            running: bool = True,
+            enabled: bool = True,
+            delay: float = None,
+            raw: bool = False,
+            columns: bool = False,
+            heartbeat: float = None,
+            idle: float = None,
+            data: ... = None
+    ) -> None:
+
+        self.resume = resume
+        self.reconnect = reconnect
+        self.subscription = subscription
+        self.window = window
+        self.window_size = window_size
+
+        ReceiverUnix.__init__(
+            self,
+            path=path,
+            callbacks=callbacks,
+            paused=paused,
+            running=running,
+            enabled=enabled,
+            delay=delay,
+            raw=raw,
+            columns=columns,
+            heartbeat=heartbeat,
+            idle=idle,
+            controllers=controllers,
+            handler=handler,
+            data=data
+        )
+
+    async def connect(self) -> None:
+
+        self.reader, self.writer = await asyncio.open_unix_connection(
+            path=self.path
+        )
+
+class ReceiverUnixServer(ReceiverUnix, ReceiverSocketServer):
+
+    created: tuple[int, int] | None = None
+
+    async def connect(self) -> None:
+
+        clear_socket(self.path)
+
+        self.server = await asyncio.start_unix_server(
+            self._handling_loop, self.path
+        )
+
+        self.created = socket_identity(self.path)
+
+    async def close(self) -> None:
+
+        await super().close()
+
+        # another server may have been bound to the path since
+        remove_socket(self.path, self.created)
+
+        self.created = None
+
+class ReceiverSharedMemoryClient(ReceiverClient):
+    """
+    Reads the frames of a shared memory ring written by a sender server.
+
+    The reader sleeps until the writer wakes it up over a unix datagram
+    socket, and polls the ring every poll seconds as the fallback for a
+    missed wakeup, or every delay seconds without unix sockets.
+    """
+
+    POLL = 0.05
+
+    ring: SharedRing | None = None
+    reader: RingReader | None = None
+    waiter: RingWaiter | None = None
+
+    def __init__(
+            self,
+            name: str,
+            callbacks: list[Callback] = None,
+            controllers: list[Controller] = None,
+            handler: Handler = None,
+            paused: bool = False,
+            running: bool = True,
+            enabled: bool = True,
+            delay: float = None,
+            poll: float = None,
+            columns: bool = False,
+            data: ... = None
+    ) -> None:
+
+        self.name = name
+        self.poll = poll or self.POLL
+        self.columns = columns
+
+        super().__init__(
+            callbacks=callbacks,
+            paused=paused,
+            running=running,
+            enabled=enabled,
+            delay=delay,
+            controllers=controllers,
+            handler=handler,
+            data=data
+        )
+
+    @property
+    def overruns(self) -> int:
+
+        return self.reader.overruns if self.reader is not None else 0
+
+    async def receive(self, reader: RingReader = None) -> None:
+
+        for frame in reader.read():
+            await self.accept(frame)
+
+    async def _handling_loop(self, reader: RingReader) -> None:
+
+        while self.running:
+            if self.paused:
+                await asyncio.sleep(self.delay)
+
+                continue
+
+            with self.handler:
+                await self.handle(reader=reader)
+
+            if self.handler.caught and self.handler.exit:
+                self.running = False
+
+                break
+
+            if self.running and not reader.pending():
+                await self.waiter.wait(
+                    self.poll if self.waiter.opened else self.delay
+                )
+
+    async def connect(self) -> None:
+
+        self.ring = SharedRing.attach(name=self.name)
+        self.reader = self.ring.reader()
+
+        self.waiter = RingWaiter(name=self.name)
+        self.waiter.open()
+
+    async def close(self) -> None:
+
+        self.running = False
+        self.reader = None
+
+        self.waiter.close()
+        self.ring.close()
+
+    async def start(self) -> None:
+
+        await super().start()
+
+        self.running = True
+
+        await self._handling_loop(reader=self.reader)
+
+type Address = tuple[str, int]
+
+class DatagramCollector(asyncio.DatagramProtocol):
+
+    def __init__(
+            self,
+            datagrams: deque[tuple[bytes, Address]],
+            drop: Callable[[bytes, Address], None] = None
+    ) -> None:
+
+        self.datagrams = datagrams
+        self.drop = drop
+
+    def datagram_received(self, data: bytes, addr: Address) -> None:
+
+        datagrams = self.datagrams
+
+        # a full queue drops its oldest datagram
+        if len(datagrams) == datagrams.maxlen and self.drop is not None:
+            self.drop(*datagrams[0])
+
+        datagrams.append((data, addr))
+
+class ReceiverDatagramServer(ReceiverServer):
+    """
+    Receives sequenced UDP datagrams of packed records.
+
+    Sequence numbers are tracked per sender session. A skipped sequence
+    counts as a gap and its missing datagrams as lost, a datagram older
+    than the expected sequence counts as late and is dropped. At most
+    limit datagrams wait to be handled, and once the queue is full, the
+    oldest one is dropped, counted as dropped and, by the gap it leaves,
+    as lost.
+    """
+
+    LIMIT = 2 ** 16
+
+    transport: asyncio.DatagramTransport | None = None
+
+    def __init__(
+            self,
+            host: str,
+            port: int,
+            callbacks: list[Callback] = None,
+            controllers: list[Controller] = None,
+            handler: Handler = None,
+            paused: bool = False,
+            running: bool = True,
+            enabled: bool = True,
+            delay: float = None,
+            columns: bool = False,
+            limit: int = None,
+            data: ... = None
+    ) -> None:
+
+        self.host = host
+        self.port = port
+        self.columns = columns
+        self.limit = limit or self.LIMIT
+
+        self.datagrams: deque[tuple[bytes, Address]] = deque(
+            maxlen=self.limit
+        )
+        self.sessions: dict[Address, tuple[int, int]] = {}
+
+        self.received = 0
+        self.gaps = 0
+        self.lost = 0
+        self.late = 0
+        self.invalid = 0
+        self.dropped = 0
+
+        super().__init__(
+            callbacks=callbacks,
+            paused=paused,
+            running=running,
+            enabled=enabled,
+            delay=delay,
+            controllers=controllers,
+            handler=handler,
+            data=data
+        )
+
+    def drop(self, datagram: bytes, address: Address) -> None:
+        """
+        Counts a datagram dropped from the full queue.
+
+        The dropped datagram is older than the queued ones of its sender,
+        so it is counted as lost by the gap before the next one, even when
+        it is the first datagram of the sender.
+
+        :param datagram: The dropped datagram.
+        :param address: The address of its sender.
+        """
+
+        self.dropped += 1
+
+        if address in self.sessions:
+            return
+
+        try:
+            session, sequence, _ = unpack_datagram(datagram)
+
+        except ValueError:
+            return
+
+        self.sessions[address] = (session, sequence)
+
+    async def receive(self, datagram: bytes, address: Address) -> None:
+
+        try:
+            session, sequence, packets = unpack_datagram(datagram)
+
+        except ValueError:
+            self.invalid += 1
+
+            return
+
+        current, expected = self.sessions.get(address, (session, sequence))
+
+        if current == session:
+            if sequence < expected:
+                self.late += 1
+
+                return
+
+            if sequence > expected:
+                self.gaps += 1
+                self.lost += sequence - expected
+
+        self.sessions[address] = (session, sequence + 1)
+        self.received += 1
+
+        for packet in packets:
+            await self.accept(packet)
+
+    async def _handling_loop(self) -> None:
+
+        while self.running:
+            await asyncio.sleep(self.delay)
+
+            if self.paused:
+                continue
+
+            while self.datagrams:
+                datagram, address = self.datagrams.popleft()
+
+                with self.handler:
+                    await self.handle(datagram=datagram, address=address)
+
+                if self.handler.caught and self.handler.exit:
+                    self.running = False
+
+                    break
+
+    async def connect(self) -> None:
+
+        loop = asyncio.get_running_loop()
+
+        self.transport, _ = await loop.create_datagram_endpoint(
+            lambda: DatagramCollector(self.datagrams, self.drop),
+            local_addr=(self.host, self.port)
+        )
+
+    async def close(self) -> None:
+
+        self.running = False
+
+        self.transport.close()
+
+    async def start(self) -> None:
+
+        await super().start()
+
+        self.running = True
+
+        await self._handling_loop()
+
+class FrameCollector(asyncio.Protocol):
+    """
+    Parses the frames of a stream connection into a shared queue.
+
+    The frames are parsed as the data arrives, so many connections are
+    read without a coroutine for each, and the event is set to wake the
+    single loop that handles the frames of all of them.
+    """
+
+    def __init__(
+            self,
+            source: int,
+            frames: deque[tuple[int, Frame | None]],
+            event: asyncio.Event
+    ) -> None:
+
+        self.source = source
+        self.frames = frames
+        self.event = event
+
+        self.buffer = bytearray()
+        self.transport: asyncio.Transport | None = None
+
+    def connection_made(self, transport: asyncio.Transport) -> None:
+
+        self.transport = transport
+
+    def data_received(self, data: bytes) -> None:
+
+        buffer = self.buffer
+        buffer += data
+
+        offset = 0
+
+        while len(buffer) - offset >= FRAME_HEADER.size:
+            if buffer[offset] != FRAME_MAGIC:
+                length = int(buffer[offset:offset + FRAME_HEADER.size])
+                kind = flags = sequence = 0
+
+            else:
+                _, kind, flags, length, sequence = (
+                    FRAME_HEADER.unpack_from(buffer, offset)
+                )
+
+            end = offset + FRAME_HEADER.size + length
+
+            if end > len(buffer):
+                break
+
+            self.frames.append(
+                (
+                    self.source,
+                    Frame(
+                        payload=bytes(buffer[end - length:end]),
+                        sequence=sequence,
+                        kind=kind,
+                        flags=flags
+                    )
+                )
+            )
+
+            offset = end
+
+        if offset:
+            del buffer[:offset]
+
+            self.event.set()
+
+    def connection_lost(self, exc: Exception | None) -> None:
+
+        self.frames.append((self.source, None))
+        self.event.set()
+
+type Key = float | int | str
+
+class ReceiverMergeClient(ReceiverClient):
+    """
+    Receives from many socket senders, merged into one ordered stream.
+
+    The records of all the upstream connections are ordered by a key,
+    the name of a record attribute, like a timestamp, a function of the
+    record, or by default the sequence number of its frame. Every linked
+    upstream has a watermark, the largest key it has sent, which is
+    unknown until its first record. Records wait in a heap until every
+    linked upstream has sent a key larger than theirs by at least the
+    reorder window, which bounds how far out of order a single upstream
+    may send, or until the heap holds more than depth records. With
+    linger, upstreams that have not sent anything are no longer waited
+    for after records were held for that many seconds, and the heap is
+    flushed when nothing has been received for that long. A record with
+    a key below one that was already delivered is counted as late and
+    dropped.
+
+    All the connections are read by protocol callbacks into one queue,
+    and a single loop merges them and delivers every released run to
+    the callbacks as one list in key order, or record by record without
+    batches.
+    """
+
+    def __init__(
+            self,
+            upstreams: Iterable[tuple[str, int]],
+            key: str | Callable[[ModelIO | Frame], Key] = None,
+            reorder: float = None,
+            depth: int = 10_000,
+            linger: float = None,
+            reconnect: float = None,
+            subscription: Iterable[str | type[ModelIO]] = None,
+            callbacks: list[Callback] = None,
+            controllers: list[Controller] = None,
+            handler: Handler = None,
+            paused: bool = False,
+            running: bool = True,
+            enabled: bool = True,
+            delay: float = None,
+            raw: bool = False,
+            batches: bool = True,
+            data: ... = None
+    ) -> None:
+
+        if isinstance(key, str):
+            key = operator.attrgetter(key)
+
+        self.upstreams = list(upstreams)
+        self.key = key
+        self.reorder = reorder
+        self.depth = depth
+        self.linger = linger
+        self.reconnect = reconnect
+        self.subscription = subscription
+        self.raw = raw
+        self.batches = batches
+
+        self.frames: deque[tuple[int, Frame | None]] = deque()
+        self.event = asyncio.Event()
+        self.collectors: dict[int, FrameCollector] = {}
+
+        self.heap: list[tuple[Key, int, ModelIO | Frame]] = []
+        self.order = 0
+        self.keys: dict[int, Key | None] = {}
+        self.held: float | None = None
+        self.released: Key | None = None
+        self.sequences = [0] * len(self.upstreams)
+
+        self.tasks: set[asyncio.Task] = set()
+
+        self.received = 0
+        self.duplicates = 0
+        self.gaps = 0
+        self.late = 0
+
+        super().__init__(
+            callbacks=callbacks,
+            paused=paused,
+            running=running,
+            enabled=enabled,
+            delay=delay,
+            controllers=controllers,
+            handler=handler,
+            data=data
+        )
+
+    def push(self, source: int, frame: Frame) -> None:
+
+        if frame.sequence:
+            if frame.sequence <= self.sequences[source]:
+                self.duplicates += 1
+
+                return
+
+            if (
+                self.sequences[source] and
+                frame.sequence > self.sequences[source] + 1
+            ):
+                self.gaps += 1
+
+            self.sequences[source] = frame.sequence
+
+        if not frame.payload:
+            return
+
+        item = frame if self.raw else decode(frame.payload)
+
+        if type(item) is ColumnBatch:
+            for record in item.records():
+                self.merge(source, frame, record)
+
+        else:
+            self.merge(source, frame, item)
+
+    def merge(self, source: int, frame: Frame, item: ModelIO | Frame) -> None:
+
+        key = frame.sequence if self.key is None else self.key(item)
+
+        self.received += 1
+
+        if self.released is not None and key < self.released:
+            self.late += 1
+
+            return
+
+        heapq.heappush(self.heap, (key, self.order, item))
+
+        self.order += 1
+
+        if self.keys.get(source) is None or key > self.keys[source]:
+            self.keys[source] = key
+
+    def release(self, flush: bool = False) -> list[ModelIO | Frame]:
+        """
+        Pops the records that can no longer be preceded by others.
+
+        :param flush: The value to release all the records.
+
+        :return: The released records, in key order.
+        """
+
+        heap = self.heap
+
+        if not heap:
+            return []
+
+        keys = [key for key in self.keys.values() if key is not None]
+
+        # an upstream that has not sent anything yet may still send
+        # records preceding all the held ones
+        waiting = len(keys) < len(self.keys)
+
+        if not waiting:
+            self.held = None
+
+        elif self.linger is not None:
+            now = asyncio.get_running_loop().time()
+
+            if self.held is None:
+                self.held = now
+
+            waiting = now - self.held < self.linger
+
+        everything = flush or (not keys and not waiting)
+
+        limit = None
+
+        if keys:
+            limit = min(keys)
+
+            if self.reorder:
+                limit -= self.reorder
+
+        released = []
+
+        while heap and (
+            everything or
+            len(heap) > self.depth or
+            (not waiting and heap[0][0] <= limit)
+        ):
+            key, _, item = heapq.heappop(heap)
+
+            released.append(item)
+
+        if released:
+            self.released = key
+
+        return released
+
+    async def receive(self) -> None:
+
+        frames = self.frames
+
+        while frames:
+            source, frame = frames.popleft()
+
+            if frame is None:
+                self.lost(source)
+
+            elif frame.kind == Frame.SESSION:
+                self.sequences[source] = 0
+
+            elif frame.kind == Frame.DATA:
+                self.push(source, frame)
+
+        await self.deliver(self.release())
+
+    async def deliver(self, released: list[ModelIO | Frame]) -> None:
+        """
+        Passes a released run to the callbacks, as one list or by record.
+
+        :param released: The released records, in key order.
+        """
+
+        if not released:
+            return
+
+        if self.batches:
+            await self.async_callback(data=released)
+
+            return
+
+        for item in released:
+            await self.async_callback(data=item)
+
+    def lost(self, source: int) -> None:
+
+        self.collectors.pop(source, None)
+        self.keys.pop(source, None)
+
+        if self.reconnect is not None and self.running and not self.closed:
+            task = asyncio.create_task(self.relink(source))
+
+            self.tasks.add(task)
+            task.add_done_callback(self.tasks.discard)
+
+    async def relink(self, source: int) -> None:
+
+        await asyncio.sleep(self.reconnect)
+
+        if self.running and not self.closed:
+            await self.link(source)
+
+    async def link(self, source: int) -> None:
+        """
+        Connects to an upstream, retrying while reconnecting.
+
+        :param source: The index of the upstream.
+        """
+
+        loop = asyncio.get_running_loop()
+
+        host, port = self.upstreams[source]
+
+        try:
+            transport, collector = await loop.create_connection(
+                lambda: FrameCollector(source, self.frames, self.event),
+                host=host,
+                port=port
+            )
+
+        except OSError:
+            if self.reconnect is None:
+                raise
+
+            self.lost(source)
+
+            return
+
+        self.collectors[source] = collector
+
+        # the watermark of the upstream is unknown until its first record
+        self.keys[source] = None
+
+        if self.subscription is not None:
+            names = (
+                name if isinstance(name, str) else
+                name.__model__ or name.__name__
+                for name in self.subscription
+            )
+
+            transport.write(
+                Frame(
+                    payload=",".join(names).encode(), kind=Frame.SUBSCRIBE
+                ).pack()
+            )
+
+        # asks the upstream to start sending, without resuming
+        transport.write(Frame(kind=Frame.RESUME).pack())
+
+    async def _handling_loop(self) -> None:
+
+        while self.running:
+            if not self.event.is_set() and self.linger is not None:
+                try:
+                    async with asyncio.timeout(self.linger):
+                        await self.event.wait()
+
+                except TimeoutError:
+                    await self.deliver(self.release(flush=True))
+
+                    continue
+
+            else:
+                await self.event.wait()
+
+            self.event.clear()
+
+            if self.paused:
+                await asyncio.sleep(self.delay)
+
+                self.event.set()
+
+                continue
+
+            with self.handler:
+                await self.handle()
+
+            if self.handler.caught and self.handler.exit:
+                self.running = False
+
+                break
+
+    async def connect(self) -> None:
+
+        await asyncio.gather(
+            *(self.link(source) for source in range(len(self.upstreams)))
+        )
+
+    async def close(self) -> None:
+
+        self.running = False
+
+        for task in tuple(self.tasks):
+            task.cancel()
+
+        for collector in tuple(self.collectors.values()):
+            collector.transport.close()
+
+        self.event.set()
+
+    async def start(self) -> None:
+
+        await super().start()
+
+        self.running = True
+
+        await self._handling_loop()
+
+class Receiver:
+
+    class Socket:
+
+        Server = ReceiverSocketServer
+        Client = ReceiverSocketClient
+
+    class Unix:
+
+        Server = ReceiverUnixServer
+        Client = ReceiverUnixClient
+
+    class SharedMemory:
+
+        Client = ReceiverSharedMemoryClient
+
+    class Datagram:
+
+        Server = ReceiverDatagramServer
+
+    class WebSocket:
+
+        Server = ReceiverWebSocketServer
+        Client = ReceiverWebSocketClient
+
+    class Merge:
+
+        Client = ReceiverMergeClient
@@ -0,0 +1,321 @@
+# registry.py
+
+import asyncio
+from dataclasses import dataclass, field
+from typing import Iterable, Generator, Callable
+
+from dataplace.control import Controller
+from dataplace.frame import Frame
+from dataplace.spill import SpillFile
+
+__all__ = [
+    "Connection",
+    "ConnectionRegistry"
+]
+
+@dataclass(slots=True, eq=False)
+class Connection:
+    """
+    The state of a connection of a sender server.
+
+    Connections are compared and hashed by identity, and the event is
+    set whenever items are added to the queue, so the handling loop of
+    the connection sleeps until there is something to send. The queue
+    is the lane of priority 0, and the lanes of other priorities are
+    created as they are used. The credit is the number of frames, and
+    the credit size the number of payload bytes, the receiver allows to
+    be sent, where None means no limit. With an overflow, the items
+    of the queue beyond its limit are spilled to a file. A pending
+    connection is not sent anything until its receiver asks to resume.
+    """
+
+    queue: list = field(default_factory=list)
+    lanes: dict[int, list] = field(default_factory=dict)
+    controller: Controller = field(default_factory=Controller)
+    kwargs: dict[str, ...] = field(default_factory=dict)
+    subscription: frozenset[str] | None = None
+    read: float | None = None
+    written: float = 0.0
+    credit: int | None = None
+    credit_size: int | None = None
+    event: asyncio.Event = field(default_factory=asyncio.Event)
+    overflow: SpillFile | None = None
+    pending: bool = False
+
+    @property
+    def backlog(self) -> int:
+
+        return (
+            len(self.queue) +
+            sum(len(lane) for lane in self.lanes.values()) +
+            (0 if self.overflow is None else len(self.overflow))
+        )
+
+    def lane(self, priority: int = 0) -> list:
+
+        if not priority:
+            return self.queue
+
+        lane = self.lanes.get(priority)
+
+        if lane is None:
+            lane = self.lanes[priority] = []
+
+        return lane
+
+    def spills(self) -> bool:
+
+        overflow = self.overflow
+
+        return overflow is not None and (
+            len(overflow) > 0 or len(self.queue) >= overflow.limit
+        )
+
+    def refill(self) -> None:
+        """Moves the next spilled items back to the queue, up to its limit."""
+
+        overflow = self.overflow
+
+        if overflow and len(self.queue) < overflow.limit:
+            self.queue.extend(overflow.read(overflow.limit - len(self.queue)))
+
+    def wake(self) -> None:
+
+        self.event.set()
+
+    async def wait(self, timeout: float = None) -> None:
+        """
+        Waits until the connection is woken up, or the timeout has passed.
+
+        :param timeout: The longest time to wait.
+        """
+
+        if self.event.is_set():
+            pass
+
+        elif timeout is None:
+            await self.event.wait()
+
+        else:
+            try:
+                async with asyncio.timeout(timeout):
+                    await self.event.wait()
+
+            except TimeoutError:
+                pass
+
+        self.event.clear()
+
+class ConnectionRegistry:
+    """
+    The connections of a server, grouped by subscription.
+
+    Each group is an insertion ordered dict of connections, so adding and
+    removing a connection takes constant time. A connection without a
+    subscription gets every item, and a connection with one only gets the
+    items of the subscribed model types. Items are filtered once for each
+    group, and added to the queues of all of its connections together.
+    """
+
+    def __init__(self) -> None:
+
+        self.groups: dict[frozenset[str] | None, dict[Connection, None]] = {}
+        self.count = 0
+
+    def __len__(self) -> int:
+
+        return self.count
+
+    def __bool__(self) -> bool:
+
+        return self.count > 0
+
+    def __iter__(self) -> Generator[Connection, ..., ...]:
+
+        for group in tuple(self.groups.values()):
+            yield from tuple(group)
+
+    def __contains__(self, connection: Connection) -> bool:
+
+        return connection in self.groups.get(connection.subscription, ())
+
+    def add(self, connection: Connection) -> None:
+
+        group = self.groups.setdefault(connection.subscription, {})
+
+        if connection not in group:
+            group[connection] = None
+
+            self.count += 1
+
+    def remove(self, connection: Connection) -> None:
+
+        group = self.groups.get(connection.subscription)
+
+        if group is None or connection not in group:
+            return
+
+        del group[connection]
+
+        self.count -= 1
+
+        if not group:
+            del self.groups[connection.subscription]
+
+    def subscribe(
+            self,
+            connection: Connection,
+            subscription: Iterable[str] = None,
+            topic: Callable[[...], str | None] = None
+    ) -> None:
+        """
+        Moves a connection to the group of its new subscription.
+
+        With a topic function, the items already queued for the connection
+        that are not of the subscribed model types are removed, since they
+        may have been queued before the subscription was received.
+
+        :param connection: The connection.
+        :param subscription: The model type names, or None for every type.
+        :param topic: The function of the model type name of a record.
+        """
+
+        registered = connection in self
+
+        if registered:
+            self.remove(connection)
+
+        connection.subscription = (
+            None if subscription is None else frozenset(subscription)
+        )
+
+        if registered:
+            self.add(connection)
+
+        if topic is not None and connection.subscription is not None:
+            self.prune(connection, topic)
+
+    @staticmethod
+    def prune(
+            connection: Connection, topic: Callable[[...], str | None]
+    ) -> None:
+        """
+        Removes the queued items of a connection outside of its subscription.
+
+        Frames are matched by their payload, and frames
+        other than records are always kept.
+
+        :param connection: The connection.
+        :param topic: The function of the model type name of a record.
+        """
+
+        subscription = connection.subscription
+
+        def selected(item: ...) -> bool:
+
+            if isinstance(item, Frame):
+                if item.kind != Frame.DATA:
+                    return True
+
+                item = item.payload
+
+            name = topic(item)
+
+            return name is None or name in subscription
+
+        connection.queue[:] = filter(selected, connection.queue)
+
+        for lane in connection.lanes.values():
+            lane[:] = filter(selected, lane)
+
+    def publish(self, item: ..., topic: str = None, priority: int = 0) -> None:
+        """
+        Adds an item to the queues of the subscribed connections.
+
+        :param item: The item to add.
+        :param topic: The model type name of the item, None matches all.
+        :param priority: The priority lane of the item.
+        """
+
+        for subscription, group in self.groups.items():
+            if not (
+                subscription is None or topic is None or
+                topic in subscription
+            ):
+                continue
+
+            for connection in group:
+                if (
+                    not priority and connection.overflow is not None and
+                    connection.spills()
+                ):
+                    connection.overflow.append(item)
+
+                else:
+                    connection.lane(priority).append(item)
+
+                connection.event.set()
+
+    def enqueue(
+            self,
+            items: list,
+            topics: list[str | None] = None,
+            priorities: list[int] = None
+    ) -> None:
+        """
+        Adds a batch of items to the queues of the subscribed connections.
+
+        :param items: The items to add.
+        :param topics: The model type names of the items, None matches all.
+        :param priorities: The priority lanes of the items.
+        """
+
+        for subscription, group in self.groups.items():
+            if priorities is None and (subscription is None or topics is None):
+                lanes = {0: items}
+
+            else:
+                lanes = {}
+
+                for index, item in enumerate(items):
+                    topic = None if topics is None else topics[index]
+
+                    if (
+                        subscription is None or topic is None or
+                        topic in subscription
+                    ):
+                        lanes.setdefault(
+                            0 if priorities is None else priorities[index], []
+                        ).append(item)
+
+            if not any(lanes.values()):
+                continue
+
+            for connection in group:
+                for priority, selected in lanes.items():
+                    if not priority and connection.overflow is not None:
+                        self.spill(connection, selected)
+
+                    else:
+                        connection.lane(priority).extend(selected)
+
+                connection.event.set()
+
+    @staticmethod
+    def spill(connection: Connection, items: list) -> None:
+        """
+        Adds items to the queue of a connection up to its limit,
+        and spills the rest of them.
+
+        :param connection: The connection.
+        :param items: The items to add.
+        """
+
+        overflow = connection.overflow
+
+        room = 0 if overflow else max(overflow.limit - len(connection.queue), 0)
+
+        connection.queue.extend(items[:room])
+
+        if len(items) > room:
+            overflow.extend(items[room:])
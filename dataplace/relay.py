@@ -0,0 +1,93 @@
+# relay.py
+
+import asyncio
+from typing import Iterable
+
+from dataplace.frame import Frame
+from dataplace.callback import Callback
+from dataplace.send import SenderServer
+from dataplace.receive import ReceiverSequence
+
+__all__ = [
+    "Relay"
+]
+
+class Relay:
+    """
+    Forwards the frames of an upstream receiver to downstream senders.
+
+    The receiver is made raw, so the payloads are never decoded, and are
+    queued by the senders as they are, without encoding them again. The
+    upstream sequence numbers are checked by the receiver from the frame
+    headers, and the senders sequence the frames again when they replay.
+    Subscriptions and priorities of the senders are matched by the type
+    name of the payload, read from its tail, so relays need no model
+    classes and can be chained into fan-out trees of many levels.
+    """
+
+    def __init__(
+            self,
+            receiver: ReceiverSequence,
+            senders: SenderServer | Iterable[SenderServer]
+    ) -> None:
+
+        if isinstance(senders, SenderServer):
+            senders = [senders]
+
+        self.receiver = receiver
+        self.senders = list(senders)
+
+        if not self.senders:
+            raise ValueError("A relay requires at least one sender.")
+
+        self.receiver.raw = True
+        self.receiver.callbacks.append(
+            Callback(self.forward, types={Frame})
+        )
+
+        self.forwarded = 0
+
+        self.tasks: list[asyncio.Task] = []
+
+    async def forward(self, frame: Frame) -> None:
+        """
+        Queues the payload of an upstream frame in every sender.
+
+        :param frame: The received frame.
+        """
+
+        payload = bytes(frame.payload)
+
+        for sender in self.senders:
+            await sender.call(payload)
+
+        self.forwarded += 1
+
+    async def start(self) -> None:
+        """Starts the senders, and then receives from upstream."""
+
+        self.tasks = [
+            asyncio.create_task(sender.start()) for sender in self.senders
+        ]
+
+        await self.receiver.start()
+
+    async def stop(self) -> None:
+
+        await self.receiver.stop()
+
+        for sender in self.senders:
+            await sender.stop()
+
+    async def drain(self, timeout: float = None) -> None:
+        """
+        Stops receiving, and drains the frames already queued downstream.
+
+        :param timeout: The longest time to wait before stopping.
+        """
+
+        await self.receiver.stop()
+
+        await asyncio.gather(
+            *(sender.drain(timeout=timeout) for sender in self.senders)
+        )
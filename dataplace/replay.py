@@ -0,0 +1,97 @@
+# replay.py
+
+import time
+import itertools
+from collections import deque
+
+from dataplace.frame import Frame
+
+__all__ = [
+    "ReplayBuffer"
+]
+
+class ReplayBuffer:
+    """
+    A bounded buffer of the latest sequenced frames.
+
+    Frames are dropped from the oldest end once any of the count, size
+    (total payload bytes) or age (seconds) limits is exceeded.
+    """
+
+    def __init__(
+            self,
+            count: int = None,
+            size: int = None,
+            age: float = None
+    ) -> None:
+
+        if count is None and size is None and age is None:
+            raise ValueError(
+                "At least one of count, size or age must "
+                "be given to bound a replay buffer."
+            )
+
+        self.count = count
+        self.size = size
+        self.age = age
+
+        self.frames: deque[Frame] = deque()
+        self.times: deque[float] = deque()
+        self.bytes = 0
+
+    def __len__(self) -> int:
+
+        return len(self.frames)
+
+    @property
+    def first(self) -> int:
+
+        return self.frames[0].sequence if self.frames else 0
+
+    @property
+    def last(self) -> int:
+
+        return self.frames[-1].sequence if self.frames else 0
+
+    def append(self, frame: Frame) -> None:
+
+        self.frames.append(frame)
+        self.times.append(time.monotonic())
+        self.bytes += len(frame.payload)
+
+        self.trim()
+
+    def trim(self) -> None:
+
+        now = time.monotonic()
+
+        while self.frames and (
+            (self.count is not None and len(self.frames) > self.count) or
+            (self.size is not None and self.bytes > self.size) or
+            (self.age is not None and now - self.times[0] > self.age)
+        ):
+            self.bytes -= len(self.frames.popleft().payload)
+            self.times.popleft()
+
+    def since(self, sequence: int, until: int = None) -> list[Frame]:
+        """
+        Collects the kept frames from a sequence number.
+
+        :param sequence: The first sequence number to collect.
+        :param until: The sequence number to stop before.
+
+        :return: The frames in sequence order.
+        """
+
+        self.trim()
+
+        if not self.frames:
+            return []
+
+        start = max(sequence - self.first, 0)
+        stop = len(self.frames)
+
+        if until is not None:
+            stop = max(min(until - self.first, stop), start)
+
+        return list(itertools.islice(self.frames, start, stop))
@@ -0,0 +1,434 @@
+# ring.py
+
+import os
+import sys
+import socket
+import struct
+import asyncio
+import tempfile
+from uuid import uuid4
+from multiprocessing import shared_memory, resource_tracker
+
+from dataplace.unix import clear_socket, socket_identity, remove_socket
+
+__all__ = [
+    "SharedRing",
+    "RingReader",
+    "RingNotifier",
+    "RingWaiter",
+    "notify_address"
+]
+
+class SharedRing:
+    """
+    A single-producer, multi-consumer ring buffer of frames in shared memory.
+
+    The segment starts with a header of the data capacity, the total
+    amount of bytes ever written (the write cursor) and the end of the
+    frame currently being written (the reserve cursor), followed by the
+    data region. Each frame is a 4 bytes length prefix and the payload.
+    Readers keep their own cursors and never block the writer, a reader
+    that falls behind by more than the capacity is moved to the write
+    cursor and the overrun is counted.
+    """
+
+    HEADER = struct.Struct("=QQQ")
+    LENGTH = struct.Struct("=I")
+    WRAP = 0xFFFFFFFF
+
+    def __init__(
+            self,
+            memory: shared_memory.SharedMemory,
+            owner: bool = False
+    ) -> None:
+
+        self.memory = memory
+        self.owner = owner
+
+        if owner:
+            self.capacity = memory.size - self.HEADER.size
+
+            self.HEADER.pack_into(memory.buf, 0, self.capacity, 0, 0)
+
+        else:
+            self.capacity = self.HEADER.unpack_from(memory.buf, 0)[0]
+
+    @classmethod
+    def create(cls, name: str, size: int) -> "SharedRing":
+
+        memory = shared_memory.SharedMemory(
+            name=name, create=True, size=size + cls.HEADER.size
+        )
+
+        return cls(memory, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> "SharedRing":
+
+        # readers must not unlink the segment of the writer on exit.
+        if sys.version_info >= (3, 13):
+            memory = shared_memory.SharedMemory(name=name, track=False)
+
+        else:
+            memory = shared_memory.SharedMemory(name=name)
+
+            # noinspection PyProtectedMember
+            resource_tracker.unregister(memory._name, "shared_memory")
+
+        return cls(memory, owner=False)
+
+    @property
+    def position(self) -> int:
+
+        return self.HEADER.unpack_from(self.memory.buf, 0)[1]
+
+    @property
+    def reserve(self) -> int:
+
+        return self.HEADER.unpack_from(self.memory.buf, 0)[2]
+
+    def write(self, payload: bytes) -> None:
+
+        size = self.LENGTH.size + len(payload)
+
+        if size + self.LENGTH.size > self.capacity:
+            raise ValueError(
+                f"Frame of {len(payload)} bytes is too large "
+                f"for a ring of capacity {self.capacity}."
+            )
+
+        buffer = self.memory.buf
+        start = self.HEADER.size
+        position = self.position
+        offset = position % self.capacity
+        end = position + size
+
+        if offset + size > self.capacity:
+            end += self.capacity - offset
+
+        self.HEADER.pack_into(buffer, 0, self.capacity, position, end)
+
+        if offset + size > self.capacity:
+            if self.capacity - offset >= self.LENGTH.size:
+                self.LENGTH.pack_into(buffer, start + offset, self.WRAP)
+
+            offset = 0
+
+        self.LENGTH.pack_into(buffer, start + offset, len(payload))
+
+        offset += start + self.LENGTH.size
+
+        buffer[offset:offset + len(payload)] = payload
+
+        self.HEADER.pack_into(buffer, 0, self.capacity, end, end)
+
+    def reader(self) -> "RingReader":
+
+        return RingReader(self)
+
+    def close(self) -> None:
+
+        self.memory.close()
+
+        if self.owner:
+            self.memory.unlink()
+
+class RingReader:
+    """A cursor over a shared ring, starting at the current write position."""
+
+    def __init__(self, ring: SharedRing) -> None:
+
+        self.ring = ring
+        self.cursor = ring.position
+        self.overruns = 0
+
+    def pending(self) -> int:
+
+        return self.ring.position - self.cursor
+
+    def read(self) -> list[bytes]:
+
+        ring = self.ring
+        buffer = ring.memory.buf
+        capacity = ring.capacity
+        start = ring.HEADER.size
+        length = ring.LENGTH.size
+
+        frames = []
+
+        position = ring.position
+
+        while self.cursor < position:
+            if position - self.cursor > capacity:
+                self.overruns += 1
+                self.cursor = position
+
+                break
+
+            offset = self.cursor % capacity
+
+            if capacity - offset < length:
+                self.cursor += capacity - offset
+
+                continue
+
+            size = ring.LENGTH.unpack_from(buffer, start + offset)[0]
+
+            if ring.reserve - self.cursor > capacity:
+                self.overruns += 1
+                self.cursor = ring.position
+
+                break
+
+            if size == ring.WRAP:
+                self.cursor += capacity - offset
+
+                continue
+
+            payload = bytes(
+                buffer[start + offset + length:start + offset + length + size]
+            )
+
+            if ring.reserve - self.cursor > capacity:
+                self.overruns += 1
+                self.cursor = ring.position
+
+                break
+
+            self.cursor += length + size
+
+            frames.append(payload)
+
+        return frames
+
+def notify_address(name: str, suffix: str = "") -> str:
+    """
+    Finds the unix datagram socket address of a ring wakeup channel.
+
+    :param name: The ring name.
+    :param suffix: The suffix of a reader socket.
+
+    :return: An abstract address on linux, or a socket path otherwise.
+    """
+
+    if sys.platform.startswith("linux"):
+        return f"\0dataplace-{name}{suffix}"
+
+    return os.path.join(tempfile.gettempdir(), f"dataplace-{name}{suffix}")
+
+def bind_notify(address: str) -> tuple[socket.socket, tuple[int, int] | None]:
+    """
+    Binds a nonblocking unix datagram socket to a wakeup channel address.
+
+    :param address: The socket address.
+
+    :return: The socket and the identity of its created socket file.
+    """
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+
+    try:
+        sock.setblocking(False)
+
+        if address.startswith("\0"):
+            sock.bind(address)
+
+            return sock, None
+
+        clear_socket(address)
+        sock.bind(address)
+
+        return sock, socket_identity(address)
+
+    except BaseException:
+        sock.close()
+
+        raise
+
+def unbind_notify(
+        sock: socket.socket,
+        address: str,
+        identity: tuple[int, int] | None
+) -> None:
+    """
+    Closes a wakeup channel socket and removes its created socket file.
+
+    :param sock: The socket.
+    :param address: The socket address.
+    :param identity: The identity of the created socket file.
+    """
+
+    try:
+        asyncio.get_running_loop().remove_reader(sock.fileno())
+
+    except RuntimeError:
+        pass
+
+    sock.close()
+
+    if not address.startswith("\0"):
+        remove_socket(address, identity)
+
+class RingNotifier:
+    """
+    Wakes up the readers of a ring after frames are written into it.
+
+    Readers register by sending an empty datagram from their own socket
+    to the socket of the ring name. The writes of one event loop
+    iteration send each registered reader a single byte, a reader whose
+    socket is full already has a wakeup pending, and a reader that is
+    gone is dropped.
+    """
+
+    WAKEUP = b"\x01"
+
+    def __init__(self, name: str) -> None:
+
+        self.address = notify_address(name)
+        self.readers: set[str] = set()
+        self.scheduled = False
+
+        self.socket: socket.socket | None = None
+        self.identity: tuple[int, int] | None = None
+
+    def open(self) -> None:
+
+        self.socket, self.identity = bind_notify(self.address)
+
+        asyncio.get_running_loop().add_reader(
+            self.socket.fileno(), self.register
+        )
+
+    def register(self) -> None:
+
+        while True:
+            try:
+                _, address = self.socket.recvfrom(1)
+
+            except (BlockingIOError, InterruptedError):
+                return
+
+            if address:
+                self.readers.add(address)
+
+    def notify(self) -> None:
+
+        if self.scheduled or not self.readers or self.socket is None:
+            return
+
+        self.scheduled = True
+
+        asyncio.get_running_loop().call_soon(self.wake)
+
+    def wake(self) -> None:
+
+        self.scheduled = False
+
+        if self.socket is None:
+            return
+
+        for address in tuple(self.readers):
+            try:
+                self.socket.sendto(self.WAKEUP, address)
+
+            except (BlockingIOError, InterruptedError):
+                pass
+
+            except OSError:
+                self.readers.discard(address)
+
+    def close(self) -> None:
+
+        if self.socket is None:
+            return
+
+        unbind_notify(self.socket, self.address, self.identity)
+
+        self.socket = None
+        self.identity = None
+        self.readers.clear()
+
+class RingWaiter:
+    """
+    Waits for the wakeups of a ring notifier, with polling as the fallback.
+
+    Without a unix socket the waiter only sleeps, and when no wakeup
+    comes within the timeout it registers again, in case the writer
+    was restarted since.
+    """
+
+    def __init__(self, name: str) -> None:
+
+        self.target = notify_address(name)
+        self.address = notify_address(name, f"-{uuid4().hex[:12]}")
+
+        self.socket: socket.socket | None = None
+        self.identity: tuple[int, int] | None = None
+        self.event: asyncio.Event | None = None
+
+    @property
+    def opened(self) -> bool:
+
+        return self.socket is not None
+
+    def open(self) -> None:
+
+        self.event = asyncio.Event()
+
+        try:
+            self.socket, self.identity = bind_notify(self.address)
+
+        except (AttributeError, OSError):
+            # no unix datagram sockets, so waiting falls back to polling
+            return
+
+        asyncio.get_running_loop().add_reader(
+            self.socket.fileno(), self.woken
+        )
+
+        self.register()
+
+    def register(self) -> None:
+
+        try:
+            self.socket.sendto(b"", self.target)
+
+        except OSError:
+            pass
+
+    def woken(self) -> None:
+
+        while True:
+            try:
+                self.socket.recv(64)
+
+            except (BlockingIOError, InterruptedError):
+                break
+
+        self.event.set()
+
+    async def wait(self, timeout: float) -> None:
+
+        if self.socket is None:
+            await asyncio.sleep(timeout)
+
+            return
+
+        try:
+            async with asyncio.timeout(timeout):
+                await self.event.wait()
+
+        except TimeoutError:
+            self.register()
+
+        self.event.clear()
+
+    def close(self) -> None:
+
+        if self.socket is None:
+            return
+
+        unbind_notify(self.socket, self.address, self.identity)
+
+        self.socket = None
+        self.identity = None
@@ -1,16 +1,44 @@
 # send.py
 
 from abc import ABCMeta, abstractmethod
+import os
+import sys
+import time
+import socket
+import struct
+import random
 import asyncio
-import json
-
-# noinspection PyProtectedMember
-from websockets.legacy.server import serve, WebSocketServerProtocol, Serve
-# noinspection PyProtectedMember
-from websockets.legacy.client import WebSocketClientProtocol
-from websockets.sync.client import connect, ClientConnection
+import itertools
+import multiprocessing
+from uuid import uuid4
+from typing import Generator, TYPE_CHECKING
+
+# the websocket transports are imported when they are first connected
+if TYPE_CHECKING:
+    # noinspection PyProtectedMember
+    from websockets.legacy.server import WebSocketServerProtocol, Serve
+    # noinspection PyProtectedMember
+    from websockets.legacy.client import WebSocketClientProtocol
+    from websockets.sync.client import ClientConnection
 
 from dataplace.io import ModelIO
+from dataplace.columns import ColumnBatch
+from dataplace.ring import SharedRing, RingNotifier
+from dataplace.frame import (
+    Frame, read_frame, parse_frame, parse_credit, payload_type, encode
+)
+from dataplace.replay import ReplayBuffer
+from dataplace.registry import Connection, ConnectionRegistry
+from dataplace.spill import SpillFile
+from dataplace.store import SpaceStore
+from dataplace.unix import clear_socket, socket_identity, remove_socket
+from dataplace.datagram import (
+    pack_datagram,
+    DATAGRAM_HEADER,
+    DATAGRAM_LENGTH,
+    DATAGRAM_MTU,
+    DATAGRAM_LIMIT
+)
 from dataplace.callback import Callback
 from dataplace.base import BaseCommunicator
 from dataplace.control import Controller
@@ -26,14 +54,16 @@ __all__ = [
     "SenderSocketClient",
     "SenderWebSocketServer",
     "SenderWebSocketClient",
+    "SenderUnix",
+    "SenderUnixServer",
+    "SenderUnixClient",
+    "SenderSharedMemoryServer",
+    "SenderDatagramClient",
+    "SenderSocketClusterServer",
     "BaseSender",
     "Sender"
 ]
 
-def encode(data: ModelIO) -> bytes:
-
-    return json.dumps(data.labeled_dump()).encode()
-
 class BaseSender(BaseCommunicator, metaclass=ABCMeta):
 
     @abstractmethod
@@ -41,14 +71,60 @@ class BaseSender(BaseCommunicator, metaclass=ABCMeta):
 
         pass
 
+    async def send_all(self, data: list[ModelIO], **kwargs) -> None:
+
+        for item in data:
+            await self.send(item, **kwargs)
+
     async def handle(self, data: ModelIO, **kwargs) -> None:
 
         await self.send(data, **kwargs)
 
 class SenderServer(BaseSender, metaclass=ABCMeta):
+    """
+    Sends the records to every connected receiver through its own queue.
+
+    The connections are kept in a registry, grouped by subscription, and
+    the handling loop of a connection sleeps until records are added to
+    its queue. A receiver subscribes to model types with a subscription
+    frame, and then only gets the records of those types.
+
+    With heartbeat, a heartbeat frame is sent to a connection that has
+    been quiet for that many seconds. With idle, a connection from which
+    nothing has been read for that many seconds is considered dead, and
+    with timeout, so is a connection on which a write has not completed
+    within that many seconds. A dead or closed connection is torn down,
+    removing it from the registry.
+
+    When draining, new records are refused, and every connection is
+    closed once its queue has been sent.
+
+    With priorities, the records of the given model types, and of their
+    subclasses, are queued in the lane of their priority, where records
+    of other types have priority 0. Lanes are sent from the highest
+    priority, strictly, or with weights, in rounds taking up to the
+    weight of every lane in items. With batch, at most that many items
+    are written at once, so urgent records do not wait behind a large
+    write. As lanes reorder the records, they cannot be sequenced.
+
+    With spill, a connection queue holds at most that many records of
+    priority 0 in memory, and the later ones are written to a temporary
+    file in the spill directory, and read back in order as the queue is
+    sent, so a slow receiver gets every record without growing memory.
+    """
 
     DELAY = 0.0001
 
+    # the errors of a connection that has been lost or closed by the peer
+    DISCONNECTIONS = (
+        ConnectionError,
+        asyncio.TimeoutError,
+        asyncio.IncompleteReadError
+    )
+
+    # the errors of a malformed or truncated frame from the peer
+    MALFORMED = (ValueError, struct.error)
+
     def __init__(
             self,
             callbacks: list[Callback] = None,
@@ -59,9 +135,33 @@ class SenderServer(BaseSender, metaclass=ABCMeta):
             enabled: bool = True,
             save: bool = False,
             delay: float = None,
+            replay: ReplayBuffer = None,
+            state: SpaceStore = None,
+            depth: int = 1,
+            heartbeat: float = None,
+            idle: float = None,
+            timeout: float = None,
+            priorities: dict[type[ModelIO], int] = None,
+            weights: dict[int, int] = None,
+            batch: int = None,
+            spill: int = None,
+            spill_directory: str = None,
             data: ... = None
     ) -> None:
 
+        if priorities and replay is not None:
+            raise ValueError(
+                "Priority lanes reorder the records, so they "
+                "cannot be used together with a replay buffer."
+            )
+
+        for priority, weight in (weights or {}).items():
+            if not isinstance(weight, int) or weight < 1:
+                raise ValueError(
+                    f"Lane weights must be positive integers, "
+                    f"not {weight!r} for priority {priority}."
+                )
+
         BaseSender.__init__(
             self,
             callbacks=callbacks,
@@ -73,61 +173,587 @@ class SenderServer(BaseSender, metaclass=ABCMeta):
             handler=handler
         )
 
-        self.queues: list[list[ModelIO]] = []
-        self.queue: list[ModelIO] = []
+        self.connections = ConnectionRegistry()
+        self.queue: list[ModelIO | Frame] = []
 
         self.delay = delay or self.DELAY
         self.save = save
+        self.replay = replay
+        self.state = state
+        self.depth = depth
+        self.heartbeat = heartbeat
+        self.idle = idle
+        self.timeout = timeout
+        self.priorities = priorities or {}
+        self.weights = weights
+        self.batch = batch
+        self.spill = spill
+        self.spill_directory = spill_directory
+
+        self._priorities: dict[type | str | None, int] = {}
+
+        self.session = uuid4().hex
+        self.sequence = 0
+
+    @staticmethod
+    def topic(data: ModelIO | bytes) -> str | None:
+
+        if isinstance(data, bytes):
+            return payload_type(data)
+
+        model = type(data)
+
+        return model.__model__ or model.__name__
+
+    def priority(self, data: ModelIO | bytes) -> int:
+
+        if not self.priorities:
+            return 0
+
+        if isinstance(data, bytes):
+            # encoded records are only matched by their exact type label
+            name = payload_type(data)
+
+            priority = self._priorities.get(name)
+
+            if priority is None:
+                priority = self._priorities[name] = next(
+                    (
+                        priority for model, priority in self.priorities.items()
+                        if (model.__model__ or model.__name__) == name
+                    ),
+                    0
+                )
+
+            return priority
+
+        model = type(data)
+
+        priority = self._priorities.get(model)
+
+        if priority is None:
+            priority = self._priorities[model] = next(
+                (
+                    self.priorities[base] for base in model.__mro__
+                    if base in self.priorities
+                ),
+                0
+            )
+
+        return priority
+
+    def prepare(self, data: ModelIO | bytes) -> ModelIO | Frame:
+        """
+        Prepares a record to be queued, sequencing it when replaying.
+
+        :param data: The record, or an already encoded payload.
+
+        :return: The item to queue.
+        """
+
+        item = data
+
+        if self.replay is not None:
+            self.sequence += 1
+
+            item = Frame(
+                payload=data if isinstance(data, bytes) else encode(data),
+                sequence=self.sequence
+            )
+
+            self.replay.append(item)
+
+        if self.state is not None and not isinstance(data, bytes):
+            self.state.add(data, limit=self.depth)
+
+        return item
+
+    def flush(self) -> None:
+
+        if self.queue:
+            self.connections.enqueue(self.queue)
+
+            self.queue.clear()
 
     async def call(self, data: ModelIO) -> None:
 
-        if not self.queues and self.save:
-            self.queue.append(data)
+        if self.draining:
+            raise ValueError("Cannot send records through a draining sender.")
+
+        item = self.prepare(data)
+
+        if not self.connections and self.save:
+            self.queue.append(item)
 
         else:
-            for queue in self.queues:
-                queue.extend(self.queue)
-                queue.append(data)
+            self.flush()
 
-            self.queue.clear()
+            self.connections.publish(
+                item, self.topic(data), self.priority(data)
+            )
 
         await self.async_callback(data)
 
-    async def _handling_loop(self, **kwargs) -> None:
+    async def call_all(self, data: list[ModelIO]) -> None:
+        """
+        Sends a batch of records, adding them to every queue together.
+
+        :param data: The records to send.
+        """
+
+        if self.draining:
+            raise ValueError("Cannot send records through a draining sender.")
+
+        items = [self.prepare(record) for record in data]
+
+        if not self.connections and self.save:
+            self.queue.extend(items)
+
+        else:
+            self.flush()
+
+            self.connections.enqueue(
+                items,
+                [self.topic(record) for record in data],
+                [self.priority(record) for record in data]
+                if self.priorities else None
+            )
+
+        for record in data:
+            await self.async_callback(record)
+
+    async def call_columns(self, data: list[ModelIO]) -> None:
+        """
+        Sends a batch of records as column batches.
+
+        Each run of consecutive records of the same model type is
+        encoded into a single column batch payload, and the payloads
+        are added to every queue together, so the field names and the
+        type label are sent once for each run, and the order is kept.
+
+        :param data: The records to send.
+        """
+
+        if self.draining:
+            raise ValueError("Cannot send records through a draining sender.")
+
+        payloads = [
+            ColumnBatch.from_records(records).encode()
+            for _, records in itertools.groupby(data, type)
+        ]
+
+        if self.state is not None:
+            for record in data:
+                self.state.add(record, limit=self.depth)
+
+        items = [self.prepare(payload) for payload in payloads]
+
+        if not self.connections and self.save:
+            self.queue.extend(items)
+
+        else:
+            self.flush()
+
+            self.connections.enqueue(
+                items,
+                [self.topic(payload) for payload in payloads],
+                [self.priority(payload) for payload in payloads]
+                if self.priorities else None
+            )
+
+        for record in data:
+            await self.async_callback(record)
+
+    def snapshot(self) -> list[ModelIO | Frame]:
+        """
+        Collects the latest records of every signature in the state.
+
+        :return: The records, or unsequenced frames when sequencing.
+        """
+
+        if self.state is None:
+            return []
+
+        records = [
+            record
+            for records in self.state.values()
+            for record in records[-self.depth:]
+        ]
+
+        if self.replay is None:
+            return records
+
+        return [Frame(payload=encode(record)) for record in records]
+
+    def create_connection(self, **kwargs) -> Connection:
+
+        connection = Connection(kwargs=kwargs)
+
+        if self.spill is not None:
+            connection.overflow = SpillFile(
+                self.spill, directory=self.spill_directory
+            )
+
+        return connection
+
+    def join(self, connection: Connection) -> None:
+        """
+        Registers a new connection, with its queue starting with the snapshot.
+
+        The snapshot is taken in the same step as the registration, so
+        the connection gets every record either from the snapshot or
+        from the live queue, never from both or neither.
+
+        :param connection: The connection.
+        """
+
+        connection.queue[0:0] = self.snapshot()
+
+        self.connections.add(connection)
+
+        if connection.queue:
+            connection.wake()
+
+    def leave(self, connection: Connection) -> None:
+
+        self.connections.remove(connection)
+
+    def resume(self, queue: list[Frame], sequence: int, session: str) -> None:
+        """
+        Prepends the session frame and the missed frames to a queue.
+
+        A receiver of the current session gets the kept frames from the
+        requested sequence number. Any other receiver gets the snapshot of
+        the state in place of the queued live frames, which the snapshot
+        already includes, or without state, a receiver of a previous
+        session gets all the kept frames and a new one the live frames.
+
+        :param queue: The queue of the connection.
+        :param sequence: The first sequence number the receiver is missing.
+        :param session: The session the receiver has last been connected to.
+        """
+
+        frames = []
+
+        if session == self.session:
+            frames = self.replay.since(
+                sequence, until=queue[0].sequence if queue else None
+            )
+
+        elif self.state is not None:
+            queue.clear()
+
+            frames = self.snapshot()
+
+        elif session:
+            frames = self.replay.since(
+                1, until=queue[0].sequence if queue else None
+            )
+
+        queue[0:0] = [
+            Frame(payload=self.session.encode(), kind=Frame.SESSION),
+            *frames
+        ]
+
+    async def deliver(self, data: list[ModelIO | Frame], **kwargs) -> None:
+        """
+        Sends a batch of data, within the write timeout, if any.
+
+        :param data: The data to send.
+        """
+
+        if self.timeout is None:
+            await self.send_all(data, **kwargs)
+
+        else:
+            await asyncio.wait_for(
+                self.send_all(data, **kwargs), timeout=self.timeout
+            )
+
+    async def beat(self, **kwargs) -> None:
+
+        await self.deliver([Frame(kind=Frame.HEARTBEAT)], **kwargs)
+
+    async def disconnect(self, abort: bool = False, **kwargs) -> None:
+
+        pass
+
+    async def drained(self) -> None:
+        """
+        Waits until every connection has sent its queue and closed.
+
+        Connections still open when the wait is cancelled are aborted.
+        """
+
+        for connection in self.connections:
+            connection.wake()
+
+        try:
+            while self.connections:
+                await asyncio.sleep(self.delay)
+
+        finally:
+            for connection in self.connections:
+                connection.controller.running = False
+
+                await self.disconnect(abort=True, **connection.kwargs)
+
+        await super().drained()
+
+    def process(self, connection: Connection, frame: Frame) -> None:
+        """
+        Processes a frame received from the receiver of a connection.
+
+        :param connection: The connection.
+        :param frame: The received frame.
+        """
+
+        if frame.kind == Frame.SUBSCRIBE:
+            names = frame.payload.decode()
+
+            self.connections.subscribe(
+                connection, names.split(",") if names else None,
+                topic=self.topic
+            )
 
-        queue: list[ModelIO] = []
+        elif frame.kind == Frame.CREDIT:
+            frames, size = parse_credit(frame)
 
-        controller = Controller(
-            data=dict(kwargs=kwargs, queue=queue),
-            handler=self.handler
+            # the first grant of a receiver sets which limits apply
+            connection.credit = (
+                None if frames is None else (connection.credit or 0) + frames
+            )
+            connection.credit_size = (
+                None if size is None else (connection.credit_size or 0) + size
+            )
+
+            connection.wake()
+
+        elif frame.kind == Frame.RESUME and connection.pending:
+            self.resume(
+                connection.queue, sequence=frame.sequence,
+                session=frame.payload.decode()
+            )
+
+            # the snapshot has the records of every type
+            if connection.subscription is not None:
+                self.connections.prune(connection, self.topic)
+
+            connection.pending = False
+
+            connection.wake()
+
+    def order(self, lanes: list[tuple[int, list]]) -> Generator[int, ..., ...]:
+        """
+        Yields the indexes of the lanes to take the next items from.
+
+        :param lanes: The priorities and the lanes, from the highest.
+
+        :return: The index of a lane for every item, in sending order.
+        """
+
+        if self.weights is None:
+            for index, (_, lane) in enumerate(lanes):
+                for _ in range(len(lane)):
+                    yield index
+
+            return
+
+        remaining = [len(lane) for _, lane in lanes]
+
+        while any(remaining):
+            for index, (priority, _) in enumerate(lanes):
+                count = min(self.weights.get(priority, 1), remaining[index])
+
+                remaining[index] -= count
+
+                for _ in range(count):
+                    yield index
+
+    def take(self, connection: Connection) -> list[ModelIO | Frame | bytes]:
+        """
+        Takes the next items to send from the lanes of a connection.
+
+        Items are taken in lane order, up to the batch size and as far
+        as the credit allows. Control frames are not counted, and when
+        the credit is counted in bytes, the records are encoded to
+        measure them. At least one item is taken while there is any
+        credit left, so a record larger than the credit size can still
+        be sent.
+
+        :param connection: The connection.
+
+        :return: The items to send.
+        """
+
+        queue = connection.queue
+        credit = connection.credit
+        size = connection.credit_size
+
+        if (
+            credit is None and size is None and self.batch is None and
+            not any(connection.lanes.values())
+        ):
+            data = queue.copy()
+            queue.clear()
+
+            return data
+
+        lanes = sorted(
+            (
+                (priority, lane)
+                for priority, lane in (*connection.lanes.items(), (0, queue))
+                if lane
+            ),
+            key=lambda pair: pair[0],
+            reverse=True
+        )
+
+        counts = [0] * len(lanes)
+        data = []
+
+        for index in self.order(lanes):
+            if self.batch is not None and len(data) >= self.batch:
+                break
+
+            item = lanes[index][1][counts[index]]
+
+            if not (isinstance(item, Frame) and item.kind != Frame.DATA):
+                if (credit is not None and credit <= 0) or (
+                    size is not None and size <= 0
+                ):
+                    break
+
+                if credit is not None:
+                    credit -= 1
+
+                if size is not None:
+                    if not isinstance(item, (Frame, bytes)):
+                        item = encode(item)
+
+                    size -= len(
+                        item.payload if isinstance(item, Frame) else item
+                    )
+
+            counts[index] += 1
+
+            data.append(item)
+
+        for (_, lane), count in zip(lanes, counts):
+            del lane[:count]
+
+        connection.credit = credit
+        connection.credit_size = size
+
+        return data
+
+    async def _reading_loop(self, connection: Connection, **kwargs) -> None:
+
+        pass
+
+    async def _handling_loop(
+            self, connection: Connection = None, **kwargs
+    ) -> None:
+
+        if connection is None:
+            connection = self.create_connection(**kwargs)
+
+            self.join(connection)
+
+        controller = connection.controller
+        controller.handler = self.handler
+
+        connection.written = time.monotonic()
+
+        reading = asyncio.create_task(
+            self._reading_loop(connection, **kwargs)
         )
 
-        self.controllers.append(controller)
+        # the loop wakes up on its own only to check the liveness
+        interval = min(
+            (
+                value for value in (self.heartbeat, self.idle)
+                if value is not None
+            ),
+            default=None
+        )
+
+        dead = False
+
+        try:
+            while controller.running:
+                if self.draining and not connection.backlog:
+                    break
+
+                await connection.wait(interval)
+
+                if self.paused or controller.paused:
+                    await asyncio.sleep(self.delay)
+
+                    connection.wake()
+
+                    continue
 
-        self.queues.append(queue)
+                now = time.monotonic()
 
-        while controller.running:
-            await asyncio.sleep(self.delay)
+                if (
+                    self.idle is not None and connection.read is not None and
+                    now - connection.read > self.idle
+                ):
+                    dead = True
 
-            if controller.paused:
-                continue
+                    break
+
+                # nothing is sent before the receiver has asked to resume
+                if connection.pending:
+                    continue
+
+                connection.refill()
+
+                # without credit, the queue waits for the next grant
+                data = self.take(connection) if connection.backlog else []
 
-            if queue:
-                data = queue.pop(0)
+                if not data:
+                    if (
+                        self.heartbeat is None or
+                        now - connection.written <= self.heartbeat
+                    ):
+                        continue
+
+                    data = None
 
                 with controller.handler:
-                    await self.handle(**kwargs, data=data)
+                    if data is None:
+                        await self.beat(**kwargs)
 
-                if controller.handler.caught and controller.handler.exit:
-                    controller.running = False
+                    else:
+                        await self.deliver(data, **kwargs)
+
+                connection.written = time.monotonic()
+
+                if connection.backlog:
+                    connection.wake()
 
+                if controller.handler.caught and controller.handler.exit:
                     break
 
-        if queue in self.queues:
-            self.queues.remove(queue)
+        except self.DISCONNECTIONS:
+            dead = True
+
+        finally:
+            controller.running = False
+
+            reading.cancel()
+
+            self.leave(connection)
 
-        if controller in self.controllers:
-            self.controllers.remove(controller)
+            # the records left in the queue would be lost anyway
+            await self.disconnect(
+                abort=dead or bool(connection.backlog), **kwargs
+            )
+
+            if connection.overflow is not None:
+                connection.overflow.close()
 
 class SenderClient(BaseSender, metaclass=ABCMeta):
 
@@ -170,19 +796,43 @@ class SenderSocket(BaseSender, metaclass=ABCMeta):
         """
         Receives the data from the senders.
 
-        :param data: The data to send.
+        :param data: The data to send, or an already encoded packet.
         :param reader: The data reader.
         :param writer: The data writer.
         """
 
-        packet = encode(data)
+        writer.write(self.pack(data))
+
+        await writer.drain()
+
+    async def send_all(
+            self,
+            data: list[ModelIO],
+            reader: asyncio.StreamReader = None,
+            writer: asyncio.StreamWriter = None
+    ) -> None:
+        """
+        Sends a batch of data in a single write.
 
-        message = str(len(packet)).encode().rjust(16, b'0') + packet
+        :param data: The data to send.
+        :param reader: The data reader.
+        :param writer: The data writer.
+        """
 
-        writer.write(message)
+        writer.write(b"".join(self.pack(item) for item in data))
 
         await writer.drain()
 
+    @staticmethod
+    def pack(data: ModelIO | Frame | bytes) -> bytes:
+
+        if isinstance(data, Frame):
+            return data.pack()
+
+        packet = data if isinstance(data, bytes) else encode(data)
+
+        return str(len(packet)).encode().rjust(16, b'0') + packet
+
     async def receive(
             self,
             reader: asyncio.StreamReader = None,
@@ -215,15 +865,17 @@ type WebSocket = WebSocketServerProtocol | WebSocketClientProtocol | ClientConne
 
 class SenderWebSocket(BaseSender, metaclass=ABCMeta):
 
-    async def send(self, data: ModelIO, websocket: WebSocket = None) -> None:
+    @staticmethod
+    def packet(data: ModelIO | Frame | bytes) -> bytes:
 
-        packet = encode(data)
+        if isinstance(data, Frame):
+            return data.pack()
 
-        if not isinstance(websocket, ClientConnection):
-            await websocket.send(packet)
+        return data if isinstance(data, bytes) else encode(data)
 
-        else:
-            websocket.send(packet)
+    async def send(self, data: ModelIO, websocket: WebSocket = None) -> None:
+
+        await websocket.send(self.packet(data))
 
     async def receive(self, websocket: WebSocket = None) -> None:
 
@@ -270,9 +922,23 @@ class SenderSocketServer(SenderServer, SenderSocket):
             enabled: bool = True,
             save: bool = False,
             delay: float = None,
+            replay: ReplayBuffer = None,
+            state: SpaceStore = None,
+            depth: int = 1,
+            heartbeat: float = None,
+            idle: float = None,
+            timeout: float = None,
+            priorities: dict[type[ModelIO], int] = None,
+            weights: dict[int, int] = None,
+            batch: int = None,
+            spill: int = None,
+            spill_directory: str = None,
+            reuse_port: bool = False,
             data: ... = None
     ) -> None:
 
+        self.reuse_port = reuse_port
+
         SenderServer.__init__(
             self,
             callbacks=callbacks,
@@ -280,6 +946,17 @@ class SenderSocketServer(SenderServer, SenderSocket):
             running=running,
             delay=delay,
             save=save,
+            replay=replay,
+            state=state,
+            depth=depth,
+            heartbeat=heartbeat,
+            idle=idle,
+            timeout=timeout,
+            priorities=priorities,
+            weights=weights,
+            batch=batch,
+            spill=spill,
+            spill_directory=spill_directory,
             enabled=enabled,
             controllers=controllers,
             handler=handler,
@@ -309,55 +986,132 @@ class SenderSocketServer(SenderServer, SenderSocket):
         :param writer: The data writer.
         """
 
-        await super()._handling_loop(reader=reader, writer=writer)
+        connection: Connection | None = None
 
-    async def connect(self) -> None:
+        if self.replay is not None:
+            connection = self.create_connection(reader=reader, writer=writer)
 
-        self.server = await asyncio.start_server(
-            self._handling_loop, self.host, self.port
+            # the missed frames, or the snapshot, are prepended to the
+            # live frames once the reading loop gets the resume request
+            connection.pending = True
+
+            self.connections.add(connection)
+
+        await super()._handling_loop(
+            connection=connection, reader=reader, writer=writer
         )
 
-    async def close(self) -> None:
+    async def _reading_loop(
+            self,
+            connection: Connection,
+            reader: asyncio.StreamReader = None,
+            writer: asyncio.StreamWriter = None
+    ) -> None:
+        """
+        Reads the frames of the receiver, to notice a closed connection.
 
-        self.server.close()
+        :param connection: The connection.
+        :param reader: The data reader.
+        :param writer: The data writer.
+        """
 
-        await self.server.wait_closed()
+        connection.read = time.monotonic()
 
-    async def start(self) -> None:
+        try:
+            while connection.controller.running:
+                frame = await read_frame(reader)
 
-        await super().start()
+                if frame is None:
+                    break
 
-        async with self.server:
-            await self.server.serve_forever()
+                connection.read = time.monotonic()
 
-class SenderWebSocketClient(SenderClient, SenderWebSocket):
+                self.process(connection, frame)
 
-    client: ClientConnection | None = None
+        except (*self.DISCONNECTIONS, *self.MALFORMED):
+            pass
 
-    def __init__(
+        finally:
+            connection.controller.running = False
+            connection.wake()
+
+    async def disconnect(
             self,
-            url: str,
-            callbacks: list[Callback] = None,
-            paused: bool = False,
-            running: bool = True,
-            enabled: bool = True
+            abort: bool = False,
+            reader: asyncio.StreamReader = None,
+            writer: asyncio.StreamWriter = None
     ) -> None:
 
-        self.url = url
+        if abort:
+            writer.transport.abort()
 
-        super().__init__(
-            callbacks=callbacks,
-            paused=paused,
-            running=running,
+        else:
+            writer.close()
+
+    async def connect(self) -> None:
+
+        self.server = await asyncio.start_server(
+            self._handling_loop, self.host, self.port,
+            reuse_port=self.reuse_port or None
+        )
+
+    async def drained(self) -> None:
+
+        self.server.close()
+
+        await super().drained()
+
+    async def close(self) -> None:
+
+        self.server.close()
+
+        if sys.version_info >= (3, 13):
+            self.server.close_clients()
+
+        await self.server.wait_closed()
+
+    async def start(self) -> None:
+
+        await super().start()
+
+        async with self.server:
+            await self.server.serve_forever()
+
+class SenderWebSocketClient(SenderClient, SenderWebSocket):
+
+    client: "ClientConnection | None" = None
+
+    def __init__(
+            self,
+            url: str,
+            callbacks: list[Callback] = None,
+            paused: bool = False,
+            running: bool = True,
+            enabled: bool = True
+    ) -> None:
+
+        self.url = url
+
+        super().__init__(
+            callbacks=callbacks,
+            paused=paused,
+            running=running,
             enabled=enabled
         )
 
+    async def send(self, data: ModelIO, websocket: WebSocket = None) -> None:
+
+        # the client connection is synchronous
+        websocket.send(self.packet(data))
+
     async def call(self, data: ModelIO) -> None:
 
         await self.handle(data, self.client)
 
     async def connect(self) -> None:
 
+        from websockets.sync.client import connect
+
         self.client = connect(self.url)
 
     async def close(self) -> None:
@@ -366,7 +1120,7 @@ class SenderWebSocketClient(SenderClient, SenderWebSocket):
 
 class SenderWebSocketServer(SenderServer, SenderWebSocket):
 
-    server: Serve | None = None
+    server: "Serve | None" = None
 
     def __init__(
             self,
@@ -379,30 +1133,106 @@ class SenderWebSocketServer(SenderServer, SenderWebSocket):
             running: bool = True,
             save: bool = False,
             delay: float = None,
+            replay: ReplayBuffer = None,
+            state: SpaceStore = None,
+            depth: int = 1,
+            heartbeat: float = None,
+            idle: float = None,
+            timeout: float = None,
+            priorities: dict[type[ModelIO], int] = None,
+            weights: dict[int, int] = None,
+            batch: int = None,
+            spill: int = None,
+            spill_directory: str = None,
             data: ... = None
     ) -> None:
 
         self.host = host
         self.port = port
 
+        from websockets.exceptions import ConnectionClosed
+
+        # websockets is only imported once a websocket transport is used
+        self.DISCONNECTIONS = (*self.DISCONNECTIONS, ConnectionClosed)
+
         super().__init__(
             callbacks=callbacks,
             paused=paused,
             running=running,
             delay=delay,
             save=save,
+            replay=replay,
+            state=state,
+            depth=depth,
+            heartbeat=heartbeat,
+            idle=idle,
+            timeout=timeout,
+            priorities=priorities,
+            weights=weights,
+            batch=batch,
+            spill=spill,
+            spill_directory=spill_directory,
             controllers=controllers,
             handler=handler,
             data=data
         )
 
-    async def _handling_loop(self, websocket: WebSocketServerProtocol) -> None:
+    async def _handling_loop(
+            self, websocket: "WebSocketServerProtocol"
+    ) -> None:
 
         await super()._handling_loop(websocket=websocket)
 
+    async def _reading_loop(
+            self, connection: Connection, websocket: WebSocket = None
+    ) -> None:
+
+        try:
+            # liveness is left to the websocket pings
+            async for message in websocket:
+                self.process(connection, parse_frame(message))
+
+        except (*self.DISCONNECTIONS, *self.MALFORMED):
+            pass
+
+        finally:
+            connection.controller.running = False
+            connection.wake()
+
+    async def beat(self, websocket: WebSocket = None) -> None:
+
+        # the peer is pinged by the websocket protocol itself
+        pass
+
+    async def disconnect(
+            self, abort: bool = False, websocket: WebSocket = None
+    ) -> None:
+
+        if abort:
+            websocket.transport.abort()
+
     async def connect(self) -> None:
 
-        self.server = serve(self._handling_loop, self.host, self.port)
+        # noinspection PyProtectedMember
+        from websockets.legacy.server import serve
+
+        options = {}
+
+        if self.heartbeat is not None:
+            options["ping_interval"] = self.heartbeat
+
+        if self.idle is not None:
+            options["ping_timeout"] = self.idle
+
+        self.server = serve(
+            self._handling_loop, self.host, self.port, **options
+        )
+
+    async def drained(self) -> None:
+
+        self.server.ws_server.close(close_connections=False)
+
+        await super().drained()
 
     async def close(self) -> None:
 
@@ -417,12 +1247,489 @@ class SenderWebSocketServer(SenderServer, SenderWebSocket):
         async with self.server:
             await asyncio.Future()
 
+class SenderUnix(SenderSocket, metaclass=ABCMeta):
+
+    def __init__(
+            self,
+            path: str,
+            callbacks: list[Callback] = None,
+            controllers: list[Controller] = None,
+            handler: Handler = None,
+            paused: bool = False,
+            running: bool = True,
+            enabled: bool = True,
+            data: ... = None
+    ) -> None:
+
+        self.path = path
+
+        BaseSender.__init__(
+            self,
+            callbacks=callbacks,
+            paused=paused,
+            running=running,
+            enabled=enabled,
+            controllers=controllers,
+            handler=handler,
+            data=data
+        )
+
+class SenderUnixClient(SenderUnix, SenderSocketClient):
+
+    async def connect(self) -> None:
+
+        self.reader, self.writer = await asyncio.open_unix_connection(
+            path=self.path
+        )
+
+class SenderUnixServer(SenderUnix, SenderSocketServer):
+
+    created: tuple[int, int] | None = None
+
+    def __init__(
+            self,
+            path: str,
+            callbacks: list[Callback] = None,
+            controllers: list[Controller] = None,
+            handler: Handler = None,
+            paused: bool = False,
+            running: bool = True,
+            enabled: bool = True,
+            save: bool = False,
+            delay: float = None,
+            replay: ReplayBuffer = None,
+            state: SpaceStore = None,
+            depth: int = 1,
+            heartbeat: float = None,
+            idle: float = None,
+            timeout: float = None,
+            priorities: dict[type[ModelIO], int] = None,
+            weights: dict[int, int] = None,
+            batch: int = None,
+            spill: int = None,
+            spill_directory: str = None,
+            data: ... = None
+    ) -> None:
+
+        SenderServer.__init__(
+            self,
+            callbacks=callbacks,
+            paused=paused,
+            running=running,
+            delay=delay,
+            save=save,
+            replay=replay,
+            state=state,
+            depth=depth,
+            heartbeat=heartbeat,
+            idle=idle,
+            timeout=timeout,
+            priorities=priorities,
+            weights=weights,
+            batch=batch,
+            spill=spill,
+            spill_directory=spill_directory,
+            enabled=enabled,
+            controllers=controllers,
+            handler=handler,
+            data=data
+        )
+
+        SenderUnix.__init__(
+            self,
+            path=path,
+            callbacks=callbacks,
+            paused=paused,
+            running=running,
+            enabled=enabled,
+            controllers=controllers,
+            handler=handler,
+            data=data
+        )
+
+    async def connect(self) -> None:
+
+        clear_socket(self.path)
+
+        self.server = await asyncio.start_unix_server(
+            self._handling_loop, self.path
+        )
+
+        self.created = socket_identity(self.path)
+
+    async def close(self) -> None:
+
+        await super().close()
+
+        # another server may have been bound to the path since
+        remove_socket(self.path, self.created)
+
+        self.created = None
+
+class SenderSharedMemoryServer(BaseSender):
+    """
+    Writes records into a shared memory ring, and wakes up its readers
+    once per event loop iteration in which records were written.
+    """
+
+    SIZE = 2 ** 24
+
+    ring: SharedRing | None = None
+    notifier: RingNotifier | None = None
+
+    def __init__(
+            self,
+            name: str,
+            size: int = None,
+            callbacks: list[Callback] = None,
+            controllers: list[Controller] = None,
+            handler: Handler = None,
+            paused: bool = False,
+            running: bool = True,
+            enabled: bool = True,
+            data: ... = None
+    ) -> None:
+
+        self.name = name
+        self.size = size or self.SIZE
+
+        super().__init__(
+            callbacks=callbacks,
+            paused=paused,
+            running=running,
+            enabled=enabled,
+            controllers=controllers,
+            handler=handler,
+            data=data
+        )
+
+    async def send(self, data: ModelIO, **kwargs) -> None:
+
+        self.ring.write(encode(data))
+        self.notifier.notify()
+
+    async def call(self, data: ModelIO) -> None:
+
+        await self.handle(data)
+
+        await self.async_callback(data)
+
+    async def connect(self) -> None:
+
+        self.ring = SharedRing.create(name=self.name, size=self.size)
+
+        self.notifier = RingNotifier(name=self.name)
+
+        try:
+            self.notifier.open()
+
+        except (AttributeError, OSError):
+            # no unix datagram sockets, so the readers fall back to polling
+            self.notifier = RingNotifier(name=self.name)
+
+    async def close(self) -> None:
+
+        self.notifier.close()
+        self.ring.close()
+
+class SenderDatagramClient(SenderClient):
+    """
+    Sends records over UDP, packing the records produced in the same
+    event loop iteration into sequenced datagrams of up to mtu bytes.
+    """
+
+    transport: asyncio.DatagramTransport | None = None
+
+    def __init__(
+            self,
+            host: str,
+            port: int,
+            mtu: int = None,
+            callbacks: list[Callback] = None,
+            controllers: list[Controller] = None,
+            handler: Handler = None,
+            paused: bool = False,
+            running: bool = True,
+            enabled: bool = True,
+            data: ... = None
+    ) -> None:
+
+        self.host = host
+        self.port = port
+        self.mtu = mtu or DATAGRAM_MTU
+
+        self.session = random.getrandbits(32)
+        self.sequence = 0
+        self.packets: list[bytes] = []
+        self.size = DATAGRAM_HEADER.size
+        self.scheduled = False
+
+        super().__init__(
+            callbacks=callbacks,
+            paused=paused,
+            running=running,
+            enabled=enabled,
+            controllers=controllers,
+            handler=handler,
+            data=data
+        )
+
+    def flush(self) -> None:
+
+        self.scheduled = False
+
+        if not self.packets:
+            return
+
+        self.transport.sendto(
+            pack_datagram(self.session, self.sequence, self.packets)
+        )
+
+        self.sequence += 1
+        self.packets = []
+        self.size = DATAGRAM_HEADER.size
+
+    async def send(self, data: ModelIO, **kwargs) -> None:
+
+        packet = encode(data)
+        size = DATAGRAM_LENGTH.size + len(packet)
+
+        if DATAGRAM_HEADER.size + size > DATAGRAM_LIMIT:
+            raise ValueError(
+                f"Record of {len(packet)} bytes is too large for a datagram."
+            )
+
+        if self.packets and self.size + size > self.mtu:
+            self.flush()
+
+        self.packets.append(packet)
+        self.size += size
+
+        if not self.scheduled:
+            self.scheduled = True
+
+            asyncio.get_running_loop().call_soon(self.flush)
+
+    async def call(self, data: ModelIO) -> None:
+
+        await self.handle(data)
+
+    async def connect(self) -> None:
+
+        loop = asyncio.get_running_loop()
+
+        self.transport, _ = await loop.create_datagram_endpoint(
+            asyncio.DatagramProtocol, remote_addr=(self.host, self.port)
+        )
+
+    async def close(self) -> None:
+
+        self.flush()
+
+        self.transport.close()
+
+async def run_socket_worker(
+        name: str,
+        host: str,
+        port: int,
+        delay: float = None,
+        index: int = 0,
+        ready: "multiprocessing.synchronize.Event" = None,
+        overruns: "ctypes.Array[ctypes.c_uint64]" = None
+) -> None:
+
+    ring = SharedRing.attach(name=name)
+    reader = ring.reader()
+
+    server = SenderSocketServer(
+        host=host, port=port, delay=delay, reuse_port=True
+    )
+
+    serving = asyncio.create_task(server.start())
+
+    while not server.connected:
+        if serving.done():
+            # raises the error the server failed to start with
+            await serving
+
+            return
+
+        await asyncio.sleep(server.delay)
+
+    if ready is not None:
+        ready.set()
+
+    while server.running and not serving.done():
+        await asyncio.sleep(server.delay)
+
+        for frame in reader.read():
+            await server.call(frame)
+
+        if overruns is not None and overruns[index] != reader.overruns:
+            overruns[index] = reader.overruns
+
+    if serving.done():
+        await serving
+
+def serve_socket_worker(
+        name: str,
+        host: str,
+        port: int,
+        delay: float = None,
+        index: int = 0,
+        ready: "multiprocessing.synchronize.Event" = None,
+        overruns: "ctypes.Array[ctypes.c_uint64]" = None
+) -> None:
+
+    asyncio.run(
+        run_socket_worker(
+            name=name, host=host, port=port, delay=delay,
+            index=index, ready=ready, overruns=overruns
+        )
+    )
+
+class SenderSocketClusterServer(SenderSocket):
+    """
+    Serves socket connections from several worker processes.
+
+    The workers share the listening port with SO_REUSEPORT, so the kernel
+    spreads the connections between them. Published records are encoded
+    once into a shared memory ring that every worker reads and fans out
+    to its own connections. Connecting returns once every worker is
+    listening. A worker that falls behind the ring by more than its
+    size skips to the latest frame, and the overruns of each worker
+    are counted in a shared array.
+    """
+
+    SIZE = 2 ** 24
+
+    ring: SharedRing | None = None
+    overruns: "ctypes.Array[ctypes.c_uint64] | None" = None
+
+    def __init__(
+            self,
+            host: str,
+            port: int,
+            workers: int = None,
+            size: int = None,
+            callbacks: list[Callback] = None,
+            controllers: list[Controller] = None,
+            handler: Handler = None,
+            paused: bool = False,
+            running: bool = True,
+            enabled: bool = True,
+            delay: float = None,
+            data: ... = None
+    ) -> None:
+
+        if not hasattr(socket, "SO_REUSEPORT"):
+            raise OSError("SO_REUSEPORT is not supported on this platform.")
+
+        self.workers = workers or os.cpu_count()
+        self.size = size or self.SIZE
+        self.delay = delay or SenderServer.DELAY
+        self.name = f"dataplace-{uuid4().hex[:16]}"
+
+        self.processes: list[multiprocessing.Process] = []
+
+        super().__init__(
+            host=host,
+            port=port,
+            callbacks=callbacks,
+            paused=paused,
+            running=running,
+            enabled=enabled,
+            controllers=controllers,
+            handler=handler,
+            data=data
+        )
+
+    async def send(self, data: ModelIO, **kwargs) -> None:
+
+        self.ring.write(encode(data))
+
+    async def call(self, data: ModelIO) -> None:
+
+        await self.handle(data)
+
+        await self.async_callback(data)
+
+    async def connect(self) -> None:
+
+        self.ring = SharedRing.create(name=self.name, size=self.size)
+
+        context = multiprocessing.get_context("spawn")
+
+        self.overruns = context.Array("Q", self.workers, lock=False)
+
+        events = []
+
+        for index in range(self.workers):
+            ready = context.Event()
+
+            process = context.Process(
+                target=serve_socket_worker,
+                kwargs=dict(
+                    name=self.name,
+                    host=self.host,
+                    port=self.port,
+                    delay=self.delay,
+                    index=index,
+                    ready=ready,
+                    overruns=self.overruns
+                ),
+                daemon=True
+            )
+
+            process.start()
+
+            self.processes.append(process)
+            events.append(ready)
+
+        for process, ready in zip(self.processes, events):
+            while not ready.is_set():
+                if not process.is_alive():
+                    await self.close()
+
+                    raise OSError(
+                        f"A socket worker of {self.host}:{self.port} "
+                        f"exited before listening."
+                    )
+
+                await asyncio.sleep(self.delay)
+
+    async def close(self) -> None:
+
+        for process in self.processes:
+            process.terminate()
+
+        for process in self.processes:
+            process.join()
+
+        self.processes.clear()
+
+        self.ring.close()
+
 class Sender:
 
     class Socket:
 
         Server = SenderSocketServer
         Client = SenderSocketClient
+        Cluster = SenderSocketClusterServer
+
+    class Unix:
+
+        Server = SenderUnixServer
+        Client = SenderUnixClient
+
+    class SharedMemory:
+
+        Server = SenderSharedMemoryServer
+
+    class Datagram:
+
+        Client = SenderDatagramClient
 
     class WebSocket:
 
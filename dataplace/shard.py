@@ -0,0 +1,427 @@
+# shard.py
+
+import bisect
+import asyncio
+import hashlib
+from typing import Callable, Hashable, Iterable, Generator
+
+from dataplace.io import ModelIO
+from dataplace.store import SpaceStore
+from dataplace.callback import Callback
+from dataplace.control import Controller
+from dataplace.handler import Handler
+from dataplace.send import BaseSender
+from dataplace.receive import ReceiverSocketClient
+
+__all__ = [
+    "HashRing",
+    "ShardPublisher",
+    "ShardSubscriber",
+    "shard_hash",
+    "endpoint"
+]
+
+def shard_hash(value: bytes) -> int:
+
+    return int.from_bytes(hashlib.blake2b(value, digest_size=8).digest())
+
+def shard_key(signature: ...) -> bytes:
+
+    return repr(SpaceStore.validate_signature(signature)).encode()
+
+def endpoint(communicator: ...) -> str:
+    """
+    Creates the node name of a sender or receiver from its address.
+
+    :param communicator: The sender or receiver.
+
+    :return: The url, the path, or the host and port.
+    """
+
+    for name in ("url", "path"):
+        if isinstance(getattr(communicator, name, None), str):
+            return getattr(communicator, name)
+
+    if hasattr(communicator, "host") and hasattr(communicator, "port"):
+        return f"{communicator.host}:{communicator.port}"
+
+    raise ValueError(f"Cannot create a node name for {communicator}.")
+
+class HashRing:
+    """
+    A consistent hash ring of named nodes.
+
+    Every node is placed on the ring at vnodes points for each unit of
+    its weight, and a signature belongs to the node of the first point
+    after its hash. Adding or removing a node only moves the signatures
+    of the points next to its own, and the same nodes always give the
+    same ring, so publishers and subscribers agree on the owners without
+    talking to each other.
+    """
+
+    VNODES = 128
+
+    def __init__(
+            self,
+            nodes: Iterable[str] | dict[str, int] = None,
+            vnodes: int = None
+    ) -> None:
+
+        self.vnodes = vnodes or self.VNODES
+
+        self.weights: dict[str, int] = {}
+        self.points: list[int] = []
+        self.owners: list[str] = []
+
+        if isinstance(nodes, dict):
+            for node, weight in nodes.items():
+                self.weights[node] = weight
+
+        else:
+            for node in nodes or ():
+                self.weights[node] = 1
+
+        self.build()
+
+    def __len__(self) -> int:
+
+        return len(self.weights)
+
+    def __iter__(self) -> Generator[str, ..., ...]:
+
+        yield from self.weights
+
+    def __contains__(self, node: str) -> bool:
+
+        return node in self.weights
+
+    def build(self) -> None:
+
+        points = sorted(
+            (shard_hash(f"{node}#{index}".encode()), node)
+            for node, weight in self.weights.items()
+            for index in range(self.vnodes * weight)
+        )
+
+        self.points = [point for point, _ in points]
+        self.owners = [node for _, node in points]
+
+    def add(self, node: str, weight: int = 1) -> None:
+
+        self.weights[node] = weight
+
+        self.build()
+
+    def remove(self, node: str) -> None:
+
+        if self.weights.pop(node, None) is not None:
+            self.build()
+
+    def node(self, signature: ...) -> str:
+        """
+        Finds the node that owns a signature.
+
+        :param signature: The signature of a record.
+
+        :return: The name of the node.
+        """
+
+        if not self.points:
+            raise KeyError("The hash ring has no nodes.")
+
+        index = bisect.bisect(self.points, shard_hash(shard_key(signature)))
+
+        return self.owners[index % len(self.owners)]
+
+    def nodes(self, signatures: Iterable = None) -> set[str]:
+        """
+        Finds the nodes that own any of the signatures.
+
+        :param signatures: The signatures, or None for all of them.
+
+        :return: The names of the nodes.
+        """
+
+        if signatures is None:
+            return set(self.weights)
+
+        return {self.node(signature) for signature in signatures}
+
+class ShardPublisher(BaseSender):
+    """
+    Sends every record to the sender of the shard that owns its signature.
+
+    The shards are the nodes of a consistent hash ring, named by the
+    addresses of their sender clients, unless given by name. With a state
+    store, the latest depth records of every signature are kept, or all
+    of them with a None depth, and when a shard is added or removed, the
+    records of the signatures that moved are sent to their new owner, so
+    every shard holds the state of the signatures it owns.
+    """
+
+    def __init__(
+            self,
+            signature: Callable[[ModelIO], Hashable],
+            senders: Iterable[BaseSender] | dict[str, BaseSender],
+            vnodes: int = None,
+            state: SpaceStore = None,
+            depth: int | None = 1,
+            callbacks: list[Callback] = None,
+            controllers: list[Controller] = None,
+            handler: Handler = None,
+            paused: bool = False,
+            running: bool = True,
+            enabled: bool = True,
+            data: ... = None
+    ) -> None:
+
+        if not isinstance(senders, dict):
+            senders = {endpoint(sender): sender for sender in senders}
+
+        self.signature = signature
+        self.senders = dict(senders)
+        self.state = state
+        self.depth = depth
+
+        self.ring = HashRing(tuple(self.senders), vnodes=vnodes)
+
+        super().__init__(
+            callbacks=callbacks,
+            paused=paused,
+            running=running,
+            enabled=enabled,
+            controllers=controllers,
+            handler=handler,
+            data=data
+        )
+
+    def route(self, data: ModelIO) -> BaseSender:
+
+        return self.senders[self.ring.node(self.signature(data))]
+
+    async def send(self, data: ModelIO, **kwargs) -> None:
+
+        await self.route(data).call(data)
+
+    async def call(self, data: ModelIO) -> None:
+
+        await self.send(data)
+
+        if self.state is not None:
+            self.state.add(data, limit=self.depth)
+
+        await self.async_callback(data)
+
+    async def rebalance(self, owners: dict[tuple, str]) -> int:
+        """
+        Sends the stored records of the signatures that changed owners.
+
+        :param owners: The previous owners of the stored signatures.
+
+        :return: The number of records sent.
+        """
+
+        count = 0
+
+        for signature, records in self.state.items():
+            node = self.ring.node(signature)
+
+            if owners.get(signature) == node:
+                continue
+
+            for record in records:
+                await self.senders[node].call(record)
+
+                count += 1
+
+        return count
+
+    def owners(self) -> dict[tuple, str]:
+
+        if self.state is None or not self.ring:
+            return {}
+
+        return {
+            signature: self.ring.node(signature)
+            for signature in self.state.keys()
+        }
+
+    async def add(
+            self, sender: BaseSender, name: str = None, weight: int = 1
+    ) -> int:
+        """
+        Adds a shard, moving the signatures it now owns.
+
+        :param sender: The sender of the shard.
+        :param name: The node name, by default the address of the sender.
+        :param weight: The number of vnode sets of the shard.
+
+        :return: The number of stored records sent to their new owners.
+        """
+
+        name = name or endpoint(sender)
+
+        if name in self.senders:
+            raise ValueError(f"Shard {name} is already in the ring.")
+
+        owners = self.owners()
+
+        if self.connected:
+            await sender.start()
+
+        self.senders[name] = sender
+        self.ring.add(name, weight)
+
+        if self.state is None:
+            return 0
+
+        return await self.rebalance(owners)
+
+    async def remove(self, name: str) -> int:
+        """
+        Removes a shard, moving the signatures it owned.
+
+        :param name: The node name of the shard.
+
+        :return: The number of stored records sent to their new owners.
+        """
+
+        if name not in self.senders:
+            raise KeyError(f"Shard {name} is not in the ring.")
+
+        owners = self.owners()
+
+        self.ring.remove(name)
+        sender = self.senders.pop(name)
+
+        count = 0
+
+        if self.state is not None and self.ring:
+            count = await self.rebalance(owners)
+
+        if self.connected:
+            await sender.stop()
+
+        return count
+
+    async def connect(self) -> None:
+
+        await asyncio.gather(
+            *(sender.start() for sender in self.senders.values())
+        )
+
+    async def close(self) -> None:
+
+        for sender in self.senders.values():
+            await sender.stop()
+
+class ShardSubscriber:
+    """
+    Receives the records of some signatures from the shards that own them.
+
+    The subscriber builds the same hash ring as the publisher, from the
+    node names, and only connects to the shards that own the given
+    signatures, or to all of them without signatures. With a signature
+    function, the records of other signatures on the same shards are
+    skipped. Updating the endpoints connects to the new owners and
+    disconnects from the shards that are no longer needed.
+    """
+
+    def __init__(
+            self,
+            endpoints: dict[str, tuple[str, int]],
+            signatures: Iterable = None,
+            signature: Callable[[ModelIO], Hashable] = None,
+            vnodes: int = None,
+            callbacks: list[Callback] = None,
+            receiver: type[ReceiverSocketClient] = ReceiverSocketClient,
+            **options: ...
+    ) -> None:
+
+        self.endpoints = dict(endpoints)
+        self.signatures = (
+            None if signatures is None else {
+                SpaceStore.validate_signature(key) for key in signatures
+            }
+        )
+        self.signature = signature
+        self.vnodes = vnodes
+        self.receiver = receiver
+        self.options = options
+
+        self.ring = HashRing(tuple(self.endpoints), vnodes=vnodes)
+        self.controller = Controller(callbacks=callbacks or [])
+
+        self.receivers: dict[str, ReceiverSocketClient] = {}
+        self.tasks: dict[str, asyncio.Task] = {}
+
+    def shards(self) -> set[str]:
+
+        return self.ring.nodes(self.signatures)
+
+    async def deliver(self, data: ModelIO) -> None:
+
+        if (
+            self.signature is not None and self.signatures is not None and
+            SpaceStore.validate_signature(self.signature(data))
+            not in self.signatures
+        ):
+            return
+
+        await self.controller.async_callback(data)
+
+    def link(self, name: str) -> None:
+
+        host, port = self.endpoints[name]
+
+        receiver = self.receiver(
+            host=host,
+            port=port,
+            callbacks=[Callback(self.deliver, types={ModelIO})],
+            **self.options
+        )
+
+        self.receivers[name] = receiver
+        self.tasks[name] = asyncio.create_task(receiver.start())
+
+    async def unlink(self, name: str) -> None:
+
+        receiver = self.receivers.pop(name)
+        task = self.tasks.pop(name)
+
+        await receiver.stop()
+
+        task.cancel()
+
+    async def update(self, endpoints: dict[str, tuple[str, int]]) -> None:
+        """
+        Rebuilds the ring for new endpoints, and moves the connections.
+
+        :param endpoints: The addresses of the shards by node name.
+        """
+
+        self.endpoints = dict(endpoints)
+        self.ring = HashRing(tuple(self.endpoints), vnodes=self.vnodes)
+
+        shards = self.shards()
+
+        for name in tuple(self.receivers):
+            if name not in shards:
+                await self.unlink(name)
+
+        for name in shards:
+            if name not in self.receivers:
+                self.link(name)
+
+    async def start(self) -> None:
+
+        for name in self.shards():
+            if name not in self.receivers:
+                self.link(name)
+
+        await asyncio.gather(*self.tasks.values(), return_exceptions=True)
+
+    async def stop(self) -> None:
+
+        for name in tuple(self.receivers):
+            await self.unlink(name)
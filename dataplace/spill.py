@@ -0,0 +1,134 @@
+# spill.py
+
+import tempfile
+
+from dataplace.io import ModelIO
+from dataplace.frame import Frame, FRAME_HEADER, encode
+
+__all__ = [
+    "SpillFile"
+]
+
+class SpillFile:
+    """
+    The overflow of a connection queue, kept in a temporary file.
+
+    Once the queue holds the limit of items, the next items are appended
+    to the file as frames, and every later item follows them there until
+    the file has been read back, so the order of the queue is kept. The
+    file is read sequentially, refilling the queue as it is sent, and is
+    truncated whenever it has been read to the end. Sequenced frames are
+    read back as frames, and any other item as its encoded payload.
+    """
+
+    def __init__(self, limit: int, directory: str = None) -> None:
+
+        if limit < 1:
+            raise ValueError(f"Spill limit must be positive, not {limit}.")
+
+        self.limit = limit
+        self.directory = directory
+
+        self.file = None
+        self.count = 0
+        self.offset = 0
+        self.end = 0
+
+        self.spilled = 0
+
+    def __len__(self) -> int:
+
+        return self.count
+
+    @staticmethod
+    def pack(item: ModelIO | Frame | bytes) -> bytes:
+
+        if isinstance(item, Frame):
+            return item.pack()
+
+        if isinstance(item, bytes):
+            return Frame(payload=item).pack()
+
+        return Frame(payload=encode(item)).pack()
+
+    def append(self, item: ModelIO | Frame | bytes) -> None:
+
+        self.extend((item,))
+
+    def extend(self, items: list[ModelIO | Frame | bytes]) -> None:
+
+        data = b"".join(self.pack(item) for item in items)
+
+        if not data:
+            return
+
+        if self.file is None:
+            self.file = tempfile.TemporaryFile(dir=self.directory)
+
+        self.file.seek(self.end)
+        self.file.write(data)
+
+        self.end += len(data)
+        self.count += len(items)
+        self.spilled += len(items)
+
+    def read(self, count: int) -> list[Frame | bytes]:
+        """
+        Reads the next items from the file.
+
+        :param count: The largest number of items to read.
+
+        :return: The items, in the order they were spilled.
+        """
+
+        count = min(count, self.count)
+
+        if count <= 0:
+            return []
+
+        file = self.file
+
+        file.flush()
+        file.seek(self.offset)
+
+        items = []
+
+        for _ in range(count):
+            _, kind, flags, length, sequence = FRAME_HEADER.unpack(
+                file.read(FRAME_HEADER.size)
+            )
+
+            payload = file.read(length)
+
+            if sequence or kind != Frame.DATA:
+                items.append(
+                    Frame(
+                        payload=payload, sequence=sequence,
+                        kind=kind, flags=flags
+                    )
+                )
+
+            else:
+                items.append(payload)
+
+        self.offset = file.tell()
+        self.count -= count
+
+        if not self.count:
+            file.seek(0)
+            file.truncate()
+
+            self.offset = 0
+            self.end = 0
+
+        return items
+
+    def close(self) -> None:
+
+        if self.file is not None:
+            self.file.close()
+
+        self.file = None
+        self.count = 0
+        self.offset = 0
+        self.end = 0
@@ -149,11 +149,14 @@ class SpaceStore[S: Hashable | Iterable[Hashable], D]:
                 if sig in self.store
             ]
 
-    def add(self, record: D) -> D:
+    def add(self, record: D, limit: int = None) -> D:
 
         for container in self.containers(self.signature(record)):
             container.append(record)
 
+            if limit is not None and len(container) > limit:
+                del container[:-limit]
+
         return record
 
     def add_all(self, records: Iterable[D]) -> Iterable[D]:
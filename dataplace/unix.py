@@ -0,0 +1,62 @@
+# unix.py
+
+import os
+import stat
+
+__all__ = [
+    "clear_socket",
+    "socket_identity",
+    "remove_socket"
+]
+
+def clear_socket(path: str) -> None:
+    """
+    Removes a stale unix socket file left at a path, before binding to it.
+
+    :param path: The socket path.
+    """
+
+    try:
+        mode = os.stat(path).st_mode
+
+    except FileNotFoundError:
+        return
+
+    if not stat.S_ISSOCK(mode):
+        raise FileExistsError(
+            f"{path} exists and is not a unix socket, "
+            f"so it can not be replaced by one."
+        )
+
+    os.remove(path)
+
+def socket_identity(path: str) -> tuple[int, int] | None:
+    """
+    Finds the device and inode of the unix socket file at a path.
+
+    :param path: The socket path.
+
+    :return: The device and inode, or None when there is no socket.
+    """
+
+    try:
+        status = os.stat(path)
+
+    except FileNotFoundError:
+        return None
+
+    if not stat.S_ISSOCK(status.st_mode):
+        return None
+
+    return status.st_dev, status.st_ino
+
+def remove_socket(path: str, identity: tuple[int, int] | None) -> None:
+    """
+    Removes the unix socket file at a path, only if it is the created one.
+
+    :param path: The socket path.
+    :param identity: The device and inode of the created socket file.
+    """
+
+    if identity is not None and socket_identity(path) == identity:
+        os.remove(path)
@@ -0,0 +1,169 @@
+# record_replay.py
+
+import time
+import asyncio
+import argparse
+
+from dataplace import (
+    Sender, Receiver, Callback, Frame, CaptureWriter, CapturePlayer,
+    LatencyProbe, percentiles
+)
+
+def address(arguments: argparse.Namespace) -> dict[str, ...]:
+
+    if arguments.transport == "websocket":
+        return dict(url=f"ws://{arguments.host}:{arguments.port}")
+
+    return dict(host=arguments.host, port=arguments.port)
+
+async def record(arguments: argparse.Namespace) -> None:
+
+    writer = CaptureWriter(arguments.output)
+
+    client_type = (
+        Receiver.WebSocket.Client
+        if arguments.transport == "websocket" else
+        Receiver.Socket.Client
+    )
+
+    client = client_type(
+        **address(arguments),
+        raw=True,
+        callbacks=[Callback(writer.write, types={Frame})]
+    )
+
+    task = asyncio.create_task(client.start())
+
+    start = time.perf_counter()
+
+    while (
+        not task.done() and
+        (arguments.count is None or writer.count < arguments.count) and
+        (
+            arguments.duration is None or
+            time.perf_counter() - start < arguments.duration
+        )
+    ):
+        await asyncio.sleep(0.01)
+
+    task.cancel()
+    writer.close()
+
+    print(f"recorded {writer.count} records into {arguments.output}")
+
+async def replay(arguments: argparse.Namespace) -> None:
+
+    server_type = (
+        Sender.WebSocket.Server
+        if arguments.transport == "websocket" else
+        Sender.Socket.Server
+    )
+
+    server = server_type(host=arguments.host, port=arguments.port)
+
+    speed = None if arguments.speed == "max" else float(arguments.speed)
+
+    player = CapturePlayer(server, arguments.input, speed=speed)
+
+    tasks = [asyncio.create_task(server.start())]
+
+    await asyncio.sleep(0.2)
+
+    probes = []
+
+    for _ in range(arguments.probes):
+        probe = LatencyProbe()
+        probes.append(probe)
+
+        client_type = (
+            Receiver.WebSocket.Client
+            if arguments.transport == "websocket" else
+            Receiver.Socket.Client
+        )
+
+        client = client_type(
+            **address(arguments),
+            raw=True,
+            callbacks=[Callback(probe, types={Frame})]
+        )
+
+        tasks.append(asyncio.create_task(client.start()))
+
+    while len(server.connections) < arguments.probes:
+        await asyncio.sleep(0.01)
+
+    count = await player.play()
+
+    deadline = time.perf_counter() + arguments.timeout
+
+    while (
+        any(len(probe.times) < count for probe in probes) and
+        time.perf_counter() < deadline
+    ):
+        await asyncio.sleep(0.01)
+
+    for task in reversed(tasks):
+        task.cancel()
+
+    await asyncio.wait(tasks, timeout=1)
+
+    delivered = max(
+        (probe.times[-1] for probe in probes if probe.times), default=0
+    )
+    elapsed = (delivered or player.end) - player.start
+
+    print(
+        f"replayed {count} records in {player.elapsed:.3f}s "
+        f"(speed {arguments.speed}), delivered in {elapsed:.3f}s, "
+        f"{count / elapsed:,.0f} records/s"
+    )
+
+    latencies = [
+        latency * 1e3
+        for probe in probes
+        for latency in probe.latencies(player.times)
+    ]
+
+    print(
+        "latency (ms): " + ", ".join(
+            f"{name} {value:.3f}"
+            for name, value in percentiles(latencies).items()
+        )
+    )
+
+def main() -> None:
+
+    parser = argparse.ArgumentParser(
+        description="Records a live stream, and replays it for load testing."
+    )
+
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    recording = commands.add_parser("record")
+    recording.add_argument("output")
+    recording.add_argument("--duration", type=float)
+    recording.add_argument("--count", type=int)
+
+    replaying = commands.add_parser("replay")
+    replaying.add_argument("input")
+    replaying.add_argument("--speed", default="1", help="a multiple, or max")
+    replaying.add_argument("--probes", type=int, default=1)
+    replaying.add_argument("--timeout", type=float, default=30.0)
+
+    for command in (recording, replaying):
+        command.add_argument(
+            "--transport", choices=("socket", "websocket"), default="socket"
+        )
+        command.add_argument("--host", default="127.0.0.1")
+        command.add_argument("--port", type=int, default=5555)
+
+    arguments = parser.parse_args()
+
+    if arguments.command == "record":
+        asyncio.run(record(arguments))
+
+    else:
+        asyncio.run(replay(arguments))
+
+if __name__ == "__main__":
+    main()